@@ -1,36 +1,202 @@
+"""
+Match the XY extents of the selected walls to a target wall.
+
+To use this script:
+1. Select the walls to update.
+2. Run the script and choose a mode:
+   - Pick Target: pick a single target wall, all selected walls take its extents.
+   - Nearest Parallel: pick any number of target walls, each selected wall takes
+     the extents of the nearest parallel target.
+"""
+
 __title__ = "Extents Match"
 __author__ = "Adam Shaw"
 
-import clr
-
-clr.AddReference("RevitAPI")
-from Autodesk.Revit.DB import *
-
-clr.AddReference("RevitAPIUI")
-from Autodesk.Revit.UI.Selection import *
-
-# get the active document and transaction
-doc = __revit__.ActiveUIDocument.Document
-uidoc = __revit__.ActiveUIDocument
-tx = Transaction(doc, "Match Wall Points")
-tx.Start()
-# get the selected walls
-wall_ids = uidoc.Selection.GetElementIds()
-walls = [doc.GetElement(id) for id in wall_ids]
-# get the target wall
-target_id = uidoc.Selection.PickObject(
-    ObjectType.Element, "Select target wall"
-).ElementId
-target_wall = doc.GetElement(target_id)
-# get the start and end points of the target wall
-start_pt = target_wall.Location.Curve.GetEndPoint(0)
-end_pt = target_wall.Location.Curve.GetEndPoint(1)
-# update the start and end points of each selected wall
-for wall in walls:
-    start_z = wall.Location.Curve.GetEndPoint(0).Z
-    end_z = wall.Location.Curve.GetEndPoint(1).Z
-    start_pt = XYZ(start_pt.X, start_pt.Y, start_z)
-    end_pt = XYZ(end_pt.X, end_pt.Y, end_z)
-    wall.Location.Curve = Line.CreateBound(start_pt, end_pt)
-# commit the changes
-tx.Commit()
+import math
+
+from pyrevit import revit, DB, UI, forms
+from Autodesk.Revit.UI.Selection import ObjectType
+from revitfunctions.spatial import SegmentIndex, is_parallel
+
+doc = revit.doc
+uidoc = revit.uidoc
+
+MODE_PICK = "Pick Target"
+MODE_NEAREST = "Nearest Parallel"
+
+# Nearest parallel search settings
+SEARCH_RADIUS = 3000 / 304.8  # 3000mm
+ANGLE_TOLERANCE = 1.0 / 180 * math.pi  # 1 DEG
+XY_TOLERANCE = 1 / 304.8  # 1mm
+
+
+class WallSelectionFilter(UI.Selection.ISelectionFilter):
+    # standard API override function
+    def AllowElement(self, element):
+        return isinstance(element, DB.Wall) and isinstance(element.Location, DB.LocationCurve)
+
+    # standard API override function
+    def AllowReference(self, refer, point):
+        return False
+
+
+def get_wall_endpoints(wall):
+    """
+    Snapshot the location curve endpoints of a wall.
+
+    Args:
+        wall (DB.Wall): The wall.
+
+    Returns:
+        tuple: ((x0, y0, z0), (x1, y1, z1)) for the start and end points.
+    """
+    curve = wall.Location.Curve
+    start = curve.GetEndPoint(0)
+    end = curve.GetEndPoint(1)
+    return (start.X, start.Y, start.Z), (end.X, end.Y, end.Z)
+
+
+def get_selected_walls():
+    return [
+        elem
+        for elem in revit.get_selection()
+        if isinstance(elem, DB.Wall) and isinstance(elem.Location, DB.LocationCurve)
+    ]
+
+
+def plan_wall_curves(walls, target_for_wall):
+    """
+    Work out the new location points of every wall before touching the model.
+
+    Each wall keeps its own start/end Z values and takes the XY of its target.
+    Walls already at the target extents are left out.
+
+    Args:
+        walls (list): Walls to update.
+        target_for_wall (callable): Returns the target endpoints
+            ((x0, y0, z0), (x1, y1, z1)) for a wall's snapshot endpoints, or None.
+
+    Returns:
+        list: (wall, (x0, y0, z0), (x1, y1, z1)) for every wall that needs to move.
+    """
+    plan = []
+    for wall in walls:
+        start, end = get_wall_endpoints(wall)
+        target = target_for_wall(start, end)
+        if target is None:
+            continue
+        target_start, target_end = target
+        new_start = (target_start[0], target_start[1], start[2])
+        new_end = (target_end[0], target_end[1], end[2])
+        if all(
+            abs(a - b) < XY_TOLERANCE
+            for a, b in zip(start[:2] + end[:2], new_start[:2] + new_end[:2])
+        ):
+            continue
+        plan.append((wall, new_start, new_end))
+    return plan
+
+
+def apply_wall_curves(plan):
+    """
+    Assign the planned location curves in a single transaction.
+
+    Walls sharing the same new endpoints reuse one Line.
+
+    Args:
+        plan (list): Output of plan_wall_curves.
+    """
+    lines = {}
+    with revit.Transaction("Match Wall Points"):
+        for wall, new_start, new_end in plan:
+            key = (new_start, new_end)
+            if key not in lines:
+                lines[key] = DB.Line.CreateBound(DB.XYZ(*new_start), DB.XYZ(*new_end))
+            wall.Location.Curve = lines[key]
+
+
+def match_to_picked_target(walls):
+    try:
+        target_ref = uidoc.Selection.PickObject(
+            ObjectType.Element, WallSelectionFilter(), "Select target wall"
+        )
+    except Exception:
+        return None
+    target_endpoints = get_wall_endpoints(doc.GetElement(target_ref.ElementId))
+    return plan_wall_curves(walls, lambda start, end: target_endpoints)
+
+
+def match_to_nearest_targets(walls):
+    try:
+        target_refs = uidoc.Selection.PickObjects(
+            ObjectType.Element, WallSelectionFilter(), "Select target walls"
+        )
+    except Exception:
+        return None
+
+    wall_ids = set(wall.Id.IntegerValue for wall in walls)
+    targets = {}
+    index = SegmentIndex(SEARCH_RADIUS)
+    for target_ref in target_refs:
+        target_id = target_ref.ElementId.IntegerValue
+        if target_id in wall_ids or target_id in targets:
+            continue
+        start, end = get_wall_endpoints(doc.GetElement(target_ref.ElementId))
+        targets[target_id] = (start, end)
+        index.insert(target_id, start[:2], end[:2])
+
+    def nearest_parallel_target(start, end):
+        direction = (end[0] - start[0], end[1] - start[1])
+        mid_x = (start[0] + end[0]) / 2
+        mid_y = (start[1] + end[1]) / 2
+        key, _ = index.nearest(
+            mid_x,
+            mid_y,
+            SEARCH_RADIUS,
+            accept=lambda key, a, b: is_parallel(
+                direction, (b[0] - a[0], b[1] - a[1]), ANGLE_TOLERANCE
+            ),
+        )
+        if key is None:
+            return None
+        target_start, target_end = targets[key]
+        # Keep the wall's own direction so its exterior face doesn't flip
+        if direction[0] * (target_end[0] - target_start[0]) + direction[1] * (
+            target_end[1] - target_start[1]
+        ) < 0:
+            target_start, target_end = target_end, target_start
+        return target_start, target_end
+
+    return plan_wall_curves(walls, nearest_parallel_target)
+
+
+def main():
+    walls = get_selected_walls()
+    if not walls:
+        forms.alert("Please select at least one wall.")
+        return
+
+    mode = forms.alert(
+        "How should the selected walls be matched?",
+        options=[MODE_PICK, MODE_NEAREST],
+    )
+    if not mode:
+        return
+
+    if mode == MODE_PICK:
+        plan = match_to_picked_target(walls)
+    else:
+        plan = match_to_nearest_targets(walls)
+
+    if plan is None:
+        return
+    if not plan:
+        forms.alert("No walls needed updating.")
+        return
+
+    apply_wall_curves(plan)
+    print("Updated {} of {} walls.".format(len(plan), len(walls)))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,95 +7,184 @@ To use this script:
 4. The selected walls will be copied and split vertically at the selected levels, creating new wall segments between the levels.
 """
 
+import bisect
+
 from pyrevit import revit, DB, forms
 from System.Collections.Generic import List
 
 __title__ = "Level Split"
 __author__ = "Adam Shaw"
 
+# Only refresh the progress bar every n wall groups
+PROGRESS_STEP = 10
+
 
 def get_levels():
     levels = DB.FilteredElementCollector(revit.doc).OfClass(DB.Level).ToElements()
     return sorted(levels, key=lambda x: x.Elevation)
 
 
+def is_splittable(wall):
+    """
+    Check the wall is not profile-edited and has no top/base attachments.
+
+    Args:
+        wall (DB.Wall): The wall to check.
+
+    Returns:
+        bool: True if the wall can be split by levels.
+    """
+    return (
+        wall.SketchId.IntegerValue == -1
+        and wall.get_Parameter(DB.BuiltInParameter.WALL_TOP_IS_ATTACHED).AsInteger()
+        == 0
+        and wall.get_Parameter(DB.BuiltInParameter.WALL_BOTTOM_IS_ATTACHED).AsInteger()
+        == 0
+    )
+
+
+def get_split_levels(btm_elevation, top_elevation, level_elevations, levels):
+    """
+    Return the levels lying strictly between the wall base and top.
+
+    Args:
+        btm_elevation (float): Elevation of the wall base level.
+        top_elevation (float): Elevation of the wall top level.
+        level_elevations (list): Sorted elevations of the split levels.
+        levels (list): Split levels, sorted to match level_elevations.
+
+    Returns:
+        list: The split levels inside the wall, bottom to top.
+    """
+    lo = bisect.bisect_right(level_elevations, btm_elevation)
+    hi = bisect.bisect_left(level_elevations, top_elevation)
+    return levels[lo:hi]
+
+
+def plan_wall_splits(walls, levels):
+    """
+    Group the splittable walls by their level intervals.
+
+    Walls sharing a base level, top level and top offset are split at the same
+    levels, so each group can be copied and constrained together.
+
+    Args:
+        walls (list): Walls to split.
+        levels (list): Levels to split the walls at.
+
+    Returns:
+        dict: (base level id, top level id, top offset) mapped to a tuple of
+            (list of walls, list of levels from the first split to the top level).
+    """
+    levels = sorted(levels, key=lambda x: x.Elevation)
+    level_elevations = [level.Elevation for level in levels]
+    level_cache = {}
+    plan = {}
+
+    for wall in walls:
+        if not is_splittable(wall):
+            continue
+
+        wall_top_level_id = wall.get_Parameter(
+            DB.BuiltInParameter.WALL_HEIGHT_TYPE
+        ).AsElementId()
+        wall_btm_level_id = wall.get_Parameter(
+            DB.BuiltInParameter.WALL_BASE_CONSTRAINT
+        ).AsElementId()
+        # Unconnected walls have no top level to split towards
+        if wall_top_level_id == DB.ElementId.InvalidElementId:
+            continue
+        wall_top_offset = round(
+            wall.get_Parameter(DB.BuiltInParameter.WALL_TOP_OFFSET).AsDouble(), 6
+        )
+
+        key = (wall_btm_level_id.IntegerValue, wall_top_level_id.IntegerValue, wall_top_offset)
+        if key not in plan:
+            for level_id in (wall_btm_level_id, wall_top_level_id):
+                if level_id.IntegerValue not in level_cache:
+                    level_cache[level_id.IntegerValue] = revit.doc.GetElement(level_id)
+            wall_btm_level = level_cache[wall_btm_level_id.IntegerValue]
+            wall_top_level = level_cache[wall_top_level_id.IntegerValue]
+
+            split_levels = get_split_levels(
+                wall_btm_level.Elevation,
+                wall_top_level.Elevation,
+                level_elevations,
+                levels,
+            )
+            if not split_levels:
+                plan[key] = ([], [])
+                continue
+            plan[key] = ([], split_levels + [wall_top_level])
+
+        group_walls, group_levels = plan[key]
+        if group_levels:
+            group_walls.append(wall)
+
+    return dict((key, value) for key, value in plan.items() if value[0])
+
+
+def split_wall_group(walls, group_levels, top_offset):
+    """
+    Copy a group of walls once per segment and constrain the copies together.
+
+    Args:
+        walls (list): Walls sharing the same level intervals.
+        group_levels (list): Split levels followed by the walls' top level.
+        top_offset (float): Top offset shared by the walls.
+    """
+    wall_ids = List[DB.ElementId]([wall.Id for wall in walls])
+
+    for wall in walls:
+        wall.get_Parameter(DB.BuiltInParameter.WALL_TOP_OFFSET).Set(0)
+
+    # Create one set of copies of the walls for each segment between levels
+    for i in range(1, len(group_levels)):
+        bottom_level = group_levels[i - 1]
+        top_level = group_levels[i]
+        is_top_segment = i == len(group_levels) - 1
+
+        new_wall_ids = DB.ElementTransformUtils.CopyElements(
+            revit.doc, wall_ids, revit.doc, None, None
+        )
+        for new_wall_id in new_wall_ids:
+            new_wall = revit.doc.GetElement(new_wall_id)
+            new_wall.get_Parameter(DB.BuiltInParameter.WALL_BASE_CONSTRAINT).Set(
+                bottom_level.Id
+            )
+            new_wall.get_Parameter(DB.BuiltInParameter.WALL_HEIGHT_TYPE).Set(
+                top_level.Id
+            )
+            new_wall.get_Parameter(DB.BuiltInParameter.WALL_TOP_OFFSET).Set(
+                top_offset if is_top_segment else 0
+            )
+
+    # Update the top constraint of the original walls to the first split level
+    for wall in walls:
+        wall.get_Parameter(DB.BuiltInParameter.WALL_HEIGHT_TYPE).Set(group_levels[0].Id)
+
+
 def split_walls_by_levels(walls, levels):
+    if len(levels) < 1:
+        return
+
+    plan = plan_wall_splits(walls, levels)
+    if not plan:
+        forms.alert("No walls to split between the selected levels.")
+        return
+
     counter = 0
+    total = len(plan)
 
     try:
         with forms.ProgressBar(title="Splitting Walls") as pb:
             with revit.Transaction("Split Walls by Levels"):
-                for wall in walls:
-                    if (
-                        wall.SketchId.IntegerValue == -1
-                        and wall.get_Parameter(
-                            DB.BuiltInParameter.WALL_TOP_IS_ATTACHED
-                        ).AsInteger()
-                        == 0
-                        and wall.get_Parameter(
-                            DB.BuiltInParameter.WALL_BOTTOM_IS_ATTACHED
-                        ).AsInteger()
-                        == 0
-                    ):
-                        wall_top_level_id = wall.get_Parameter(
-                            DB.BuiltInParameter.WALL_HEIGHT_TYPE
-                        ).AsElementId()
-                        wall_top_level = revit.doc.GetElement(wall_top_level_id)
-                        wall_btm_level_id = wall.get_Parameter(
-                            DB.BuiltInParameter.WALL_BASE_CONSTRAINT
-                        ).AsElementId()
-                        wall_btm_level = revit.doc.GetElement(wall_btm_level_id)
-                        wall_top_offset = wall.get_Parameter(
-                            DB.BuiltInParameter.WALL_TOP_OFFSET
-                        ).AsDouble()
-                        wall.get_Parameter(DB.BuiltInParameter.WALL_TOP_OFFSET).Set(0)
-
-                        if len(levels) < 1:
-                            continue
-
-                        specific_levels = [
-                            level
-                            for level in levels
-                            if level.Elevation > wall_btm_level.Elevation
-                            and level.Elevation < wall_top_level.Elevation
-                        ]
-                        specific_levels.append(wall_top_level)
-
-                        new_walls = []
-
-                        # Create copies of the wall for each selected level
-                        for i in range(1, len(specific_levels)):
-                            bottom_level = specific_levels[i - 1]
-                            top_level = specific_levels[i]
-
-                            wall_ids = List[DB.ElementId]([wall.Id])
-                            new_wall_ids = DB.ElementTransformUtils.CopyElements(
-                                revit.doc, wall_ids, revit.doc, None, None
-                            )
-                            new_wall = revit.doc.GetElement(new_wall_ids[0])
-                            new_wall.get_Parameter(
-                                DB.BuiltInParameter.WALL_BASE_CONSTRAINT
-                            ).Set(bottom_level.Id)
-                            new_wall.get_Parameter(
-                                DB.BuiltInParameter.WALL_HEIGHT_TYPE
-                            ).Set(top_level.Id)
-                            new_wall.get_Parameter(
-                                DB.BuiltInParameter.WALL_TOP_OFFSET
-                            ).Set(0)
-                            new_walls.append(new_wall)
-
-                        # Update the top constraint of the original wall to the first selected level
-                        if new_walls:
-                            first_level = specific_levels[0]
-                            wall.get_Parameter(
-                                DB.BuiltInParameter.WALL_HEIGHT_TYPE
-                            ).Set(first_level.Id)
-                            new_walls[-1].get_Parameter(
-                                DB.BuiltInParameter.WALL_TOP_OFFSET
-                            ).Set(wall_top_offset)
-
-                        counter += 1
-                        pb.update_progress(counter, len(walls))
+                for key, (group_walls, group_levels) in plan.items():
+                    split_wall_group(group_walls, group_levels, key[2])
+
+                    counter += 1
+                    if counter % PROGRESS_STEP == 0 or counter == total:
+                        pb.update_progress(counter, total)
 
     except Exception as e:
         forms.alert("Failed to split walls. Error: {}".format(str(e)))
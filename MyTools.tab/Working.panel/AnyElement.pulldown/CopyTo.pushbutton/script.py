@@ -6,7 +6,7 @@ clr.AddReference('RevitAPI')
 clr.AddReference('RevitAPIUI')
 
 from Autodesk.Revit.DB import (
-    ElementTransformUtils, XYZ, CopyPasteOptions
+    ElementTransformUtils, XYZ, CopyPasteOptions, LinearArray, ArrayAnchorMember, SubTransaction
 )
 from Autodesk.Revit.UI.Selection import ObjectType
 from pyrevit import revit
@@ -17,6 +17,11 @@ doc = uidoc.Document
 view = doc.ActiveView
 opts = CopyPasteOptions()
 
+TRANSFORM_TOLERANCE = 1 / 304.8  # 1mm
+# Fewest evenly spaced copies worth making with a single array
+MIN_ARRAY_COUNT = 3
+
+
 def copy_elements_with_transform(doc, element_ids, transform):
     """
     Copy elements with the given transform.
@@ -25,11 +30,116 @@ def copy_elements_with_transform(doc, element_ids, transform):
         doc (Document): The Revit document.
         element_ids (ICollection<ElementId>): The IDs of the elements to copy.
         transform (Transform): The transform to apply to the copied elements.
+
+    Returns:
+        ICollection<ElementId>: The IDs of the new elements.
+    """
+    return ElementTransformUtils.CopyElements(doc, element_ids, doc, transform, opts)
+
+
+def transforms_match(a, b, tolerance=TRANSFORM_TOLERANCE):
+    """Check if two transforms move elements to the same place."""
+    return (
+        a.Origin.IsAlmostEqualTo(b.Origin, tolerance)
+        and a.BasisX.IsAlmostEqualTo(b.BasisX)
+        and a.BasisY.IsAlmostEqualTo(b.BasisY)
+        and a.BasisZ.IsAlmostEqualTo(b.BasisZ)
+    )
+
+
+def is_translation(transform):
+    """Check if a transform only moves elements, without rotating or mirroring them."""
+    return (
+        transform.BasisX.IsAlmostEqualTo(XYZ.BasisX)
+        and transform.BasisY.IsAlmostEqualTo(XYZ.BasisY)
+        and transform.BasisZ.IsAlmostEqualTo(XYZ.BasisZ)
+    )
+
+
+def get_distinct_transforms(source_transform, object_tos):
     """
-    new_element_ids = ElementTransformUtils.CopyElements(doc, element_ids, doc, transform, opts)
-    new_elements = [doc.GetElement(id) for id in new_element_ids]
-      
-    return new_elements
+    Work out the transform from the source to each target, dropping repeats.
+
+    Args:
+        source_transform (Transform): The transform of the source object.
+        object_tos (iterable): The target objects.
+
+    Returns:
+        tuple: (list of distinct transforms, number of targets skipped as repeats).
+    """
+    source_inverse = source_transform.Inverse
+    distinct = []
+    repeats = 0
+    for object_to in object_tos:
+        transform_diff = object_to.GetTransform().Multiply(source_inverse)
+        if transform_diff.IsIdentity:
+            repeats += 1
+        elif any(transforms_match(transform_diff, x) for x in distinct):
+            repeats += 1
+        else:
+            distinct.append(transform_diff)
+    return distinct, repeats
+
+
+def split_array_run(transforms):
+    """
+    Find the translations that form an evenly spaced run from the source.
+
+    Args:
+        transforms (list): Distinct transforms from get_distinct_transforms.
+
+    Returns:
+        tuple: (step XYZ or None, number of copies in the run, list of remaining transforms).
+    """
+    translations = sorted(
+        (x for x in transforms if is_translation(x)), key=lambda x: x.Origin.GetLength()
+    )
+    if len(translations) < MIN_ARRAY_COUNT:
+        return None, 0, transforms
+
+    step = translations[0].Origin
+    count = 0
+    for n, transform in enumerate(translations, 1):
+        if not transform.Origin.IsAlmostEqualTo(step.Multiply(n), TRANSFORM_TOLERANCE):
+            break
+        count = n
+
+    if count < MIN_ARRAY_COUNT:
+        return None, 0, transforms
+    run = translations[:count]
+    remaining = [x for x in transforms if not any(x is y for y in run)]
+    return step, count, remaining
+
+
+def array_elements(doc, element_ids, count, step):
+    """
+    Make evenly spaced copies of elements in a single call.
+
+    Args:
+        doc (Document): The Revit document.
+        element_ids (ICollection<ElementId>): The IDs of the elements to copy.
+        count (int): The number of copies, not counting the originals.
+        step (XYZ): The spacing between copies.
+
+    Returns:
+        bool: True if the elements were arrayed, False if they cannot be.
+            A failed array is rolled back, leaving the model unchanged.
+    """
+    if not all(LinearArray.IsElementArrayable(doc, x) for x in element_ids):
+        return False
+    # The array can still be refused, e.g. a vertical step from a plan view
+    sub_transaction = SubTransaction(doc)
+    sub_transaction.Start()
+    try:
+        LinearArray.ArrayElementsWithoutAssociation(
+            doc, view, element_ids, count + 1, step, ArrayAnchorMember.Second
+        )
+        sub_transaction.Commit()
+        return True
+    except Exception:
+        sub_transaction.RollBack()
+        return False
+
 
 # Get the objects to copy (assumes pre-selection)
 selection = uidoc.Selection
@@ -50,11 +160,19 @@ source_transform = object_from.GetTransform()
 object_to_refs = selection.PickObjects(
     ObjectType.Element, 'Please select target objects to copy to'
 )
-object_tos = [doc.GetElement(ref.ElementId) for ref in object_to_refs]
+object_tos = (doc.GetElement(ref.ElementId) for ref in object_to_refs)
+
+# Work out every transform before copying, so repeats are only copied once
+transforms, repeats = get_distinct_transforms(source_transform, object_tos)
+step, array_count, remaining = split_array_run(transforms)
 
 # Use 'with' statement for transaction management
 with revit.Transaction('Copy Elements'):
-    for object_to in object_tos:
-        target_transform = object_to.GetTransform()
-        transform_diff = target_transform.Multiply(source_transform.Inverse)
-        new_elements = copy_elements_with_transform(doc, objects_to_copy, transform_diff)
\ No newline at end of file
+    if step is not None and not array_elements(doc, objects_to_copy, array_count, step):
+        remaining = transforms
+        array_count = 0
+    for transform_diff in remaining:
+        copy_elements_with_transform(doc, objects_to_copy, transform_diff)
+
+print('Copied to {} locations ({} arrayed), skipped {} targets already covered.'.format(
+    len(transforms), array_count, repeats))
@@ -2,61 +2,297 @@
 Filters the current selection based on a text input for the name of the element.
 - If the input string starts with "!", the script keeps elements whose name does not contain the subsequent text.
 - If the input string does not start with "!", the script keeps elements whose name contains the input text.
+- Several terms can be separated with ",". Elements are kept if they match any
+  include term and no exclude term.
+- Terms starting with "re:" (or "!re:") are regular expressions. Commas inside
+  [...] or {...}, or escaped as "\\,", stay part of the expression.
 
 Instructions:
-1. Select elements in the Revit project.
+1. Select elements in the Revit project, or select nothing to search the view or model.
+   View and model searches match type names, plus the names of individually named
+   elements such as grids, levels, rooms, groups, views and sheets.
 2. Run this script.
 3. Enter the desired element name or a part of the name in the input dialog.
    - To exclude elements containing the text, start the input with "!".
+   - e.g. "N12, N16, !TYP" or "re:^N\\d+$"
 4. The script will filter the selection based on the input criteria.
 """
 
-from pyrevit import revit, forms
+import re
+
+from pyrevit import revit, forms, DB
+from System.Collections.Generic import List
 
 __title__ = "Filter Selection by Name"
 __author__ = "Adam Shaw"
 
+doc = revit.doc
+rvt_year = int(doc.Application.VersionNumber)
+
+SCOPE_SELECTION = "Selection"
+SCOPE_VIEW = "Active View"
+SCOPE_MODEL = "Whole Model"
+
+REGEX_PREFIX = "re:"
+
+# Above this many matching types, instances are checked against a set of type
+# ids in Python rather than through one native rule per type
+MAX_TYPE_RULES = 50
+
+# Categories whose elements are named individually rather than by their type
+INSTANCE_NAMED_CATEGORIES = [
+    DB.BuiltInCategory.OST_Grids,
+    DB.BuiltInCategory.OST_Levels,
+    DB.BuiltInCategory.OST_Rooms,
+    DB.BuiltInCategory.OST_Areas,
+    DB.BuiltInCategory.OST_MEPSpaces,
+    DB.BuiltInCategory.OST_CLines,
+    DB.BuiltInCategory.OST_VolumeOfInterest,
+    DB.BuiltInCategory.OST_IOSModelGroups,
+    DB.BuiltInCategory.OST_IOSDetailGroups,
+    DB.BuiltInCategory.OST_Views,
+    DB.BuiltInCategory.OST_Sheets,
+]
+
+
+def is_regex_term(term):
+    return term.lstrip().lstrip("!").lstrip().lower().startswith(REGEX_PREFIX)
+
+
+def split_terms(query):
+    """
+    Split the input on commas, keeping commas that belong to a regular expression.
+
+    Inside a "re:" term, commas within [...] or {...} and escaped commas ("\\,")
+    stay part of the pattern, so "re:^N\\d{1,2}$, TYP" gives two terms.
+
+    Args:
+        query (str): The user input.
+
+    Returns:
+        list: The raw terms.
+    """
+    terms = []
+    current = []
+    depth = 0
+    escaped = False
+    for char in query:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\" and is_regex_term("".join(current)):
+            current.append(char)
+            escaped = True
+        elif char == "," and depth == 0:
+            terms.append("".join(current))
+            current = []
+        else:
+            if is_regex_term("".join(current)):
+                if char in "[{":
+                    depth += 1
+                elif char in "]}" and depth > 0:
+                    depth -= 1
+            current.append(char)
+    terms.append("".join(current))
+    return terms
+
+
+def parse_query(query):
+    """
+    Split the input into include and exclude terms.
+
+    Args:
+        query (str): Comma separated terms, e.g. "N12, !TYP, re:^N\\d+$".
+
+    Returns:
+        tuple: (list of include terms, list of exclude terms, list of plain
+            include strings usable by a native filter, or None if any include
+            term is a regex). Terms are callables taking a lower case name.
+    """
+    includes = []
+    excludes = []
+    plain_includes = []
+    for term in split_terms(query):
+        term = term.strip()
+        exclude = term.startswith("!")
+        if exclude:
+            term = term[1:].strip()
+        if not term:
+            continue
+
+        if term.lower().startswith(REGEX_PREFIX):
+            pattern = re.compile(term[len(REGEX_PREFIX):], re.IGNORECASE)
+            matcher = pattern.search
+            if not exclude:
+                plain_includes = None
+        else:
+            text = term.lower()
+            matcher = lambda name, text=text: text in name
+            if not exclude and plain_includes is not None:
+                plain_includes.append(text)
+
+        if exclude:
+            excludes.append(matcher)
+        else:
+            includes.append(matcher)
+    return includes, excludes, plain_includes
+
+
+def build_name_index(elements):
+    """
+    Group elements by lower case name.
+
+    Args:
+        elements (iterable): The elements to index.
+
+    Returns:
+        dict: Lower case name mapped to a list of element ids.
+    """
+    index = {}
+    for element in elements:
+        element_name = element.Name
+        if element_name:
+            index.setdefault(element_name.lower(), []).append(element.Id)
+    return index
+
+
+def filter_index(index, includes, excludes):
+    """
+    Get the ids of the indexed elements matching the terms, testing each name once.
+
+    Args:
+        index (dict): Output of build_name_index.
+        includes (list): Include terms; an empty list includes every name.
+        excludes (list): Exclude terms.
+
+    Returns:
+        list: Matching element ids.
+    """
+    matches = []
+    for name, element_ids in index.items():
+        if includes and not any(term(name) for term in includes):
+            continue
+        if any(term(name) for term in excludes):
+            continue
+        matches.extend(element_ids)
+    return matches
+
+
+def make_or_filter(filters):
+    if len(filters) == 1:
+        return filters[0]
+    return DB.LogicalOrFilter(List[DB.ElementFilter](filters))
+
+
+def create_type_name_filter(keywords):
+    """Creates a filter to find element types whose names contain any of the keywords."""
+    f_param = DB.ParameterValueProvider(DB.ElementId(DB.BuiltInParameter.ALL_MODEL_TYPE_NAME))
+    filters = []
+    for keyword in keywords:
+        if rvt_year < 2023:
+            f_rule = DB.FilterStringRule(f_param, DB.FilterStringContains(), keyword, False)
+        else:
+            f_rule = DB.FilterStringRule(f_param, DB.FilterStringContains(), keyword)
+        filters.append(DB.ElementParameterFilter(f_rule))
+    return make_or_filter(filters)
+
+
+def create_type_filter(type_ids):
+    """Creates a filter to find elements of any of the given types."""
+    type_param_id = DB.ElementId(DB.BuiltInParameter.ELEM_TYPE_PARAM)
+    return make_or_filter([
+        DB.ElementParameterFilter(DB.ParameterFilterRuleFactory.CreateEqualsRule(type_param_id, type_id))
+        for type_id in type_ids
+    ])
+
+
+def get_scope_collector(scope):
+    if scope == SCOPE_VIEW:
+        return DB.FilteredElementCollector(doc, doc.ActiveView.Id)
+    return DB.FilteredElementCollector(doc)
+
+
+def collect_candidates(scope, includes, excludes, plain_includes):
+    """
+    Collect the elements in the view or model that may match.
+
+    Most elements are named after their type, so element types are matched
+    first (with a native rule for plain include terms) and only instances of
+    matching types are collected. Elements of INSTANCE_NAMED_CATEGORIES, such
+    as grids, levels and rooms, are collected separately by category.
+
+    Args:
+        scope (str): SCOPE_VIEW or SCOPE_MODEL.
+        includes (list): Include terms.
+        excludes (list): Exclude terms.
+        plain_includes (list): Plain include strings, or None.
+
+    Returns:
+        list: Candidate elements.
+    """
+    named_filter = DB.ElementMulticategoryFilter(List[DB.BuiltInCategory](INSTANCE_NAMED_CATEGORIES))
+    candidates = list(get_scope_collector(scope).WherePasses(named_filter).WhereElementIsNotElementType())
+
+    types = DB.FilteredElementCollector(doc).WhereElementIsElementType()
+    if plain_includes:
+        types = types.WherePasses(create_type_name_filter(plain_includes))
+    type_ids = filter_index(build_name_index(types), includes, excludes)
+    if not type_ids:
+        return candidates
+
+    typed_filter = DB.ElementMulticategoryFilter(List[DB.BuiltInCategory](INSTANCE_NAMED_CATEGORIES), True)
+    collector = get_scope_collector(scope).WhereElementIsNotElementType().WherePasses(typed_filter)
+    if len(type_ids) <= MAX_TYPE_RULES:
+        candidates.extend(collector.WherePasses(create_type_filter(type_ids)))
+    else:
+        # An OR of thousands of rules is slower than a set lookup per element
+        type_keys = set(x.IntegerValue for x in type_ids)
+        candidates.extend(x for x in collector if x.GetTypeId().IntegerValue in type_keys)
+    return candidates
+
 
 def main():
     # Retrieve the current selection
     selection = revit.get_selection()
-    
-    if not selection:
-        forms.alert("No elements selected. Please select elements and run the script again.")
-        return
-    
+
+    # Filter the selection as before, and only ask for a scope when there is none
+    if selection:
+        scope = SCOPE_SELECTION
+    else:
+        scope = forms.alert("Nothing selected. Filter elements from:", options=[SCOPE_VIEW, SCOPE_MODEL])
+        if not scope:
+            return
+
     # Prompt user for the element name filter
     element_name_filter = forms.ask_for_string(
-        prompt="Enter the element name or a part of the name (start with '!' to exclude):",
+        prompt="Enter the element name or a part of the name (start with '!' to exclude, "
+               "separate terms with ',', prefix 're:' for a regular expression).\n"
+               "View and model searches match type names, plus the names of grids, levels, "
+               "rooms, areas, spaces, reference planes, scope boxes, groups, views and sheets:",
         title="Filter Selection by Name"
     )
-    
+
     if element_name_filter is None:
         forms.alert("No element name filter provided. Script cancelled.")
         return
-    
-    # Check if the filter starts with "!" for exclusion
-    exclude_mode = element_name_filter.startswith("!")
-    
-    # Remove the "!" from the filter if in exclude mode
-    if exclude_mode:
-        element_name_filter = element_name_filter[1:]
-    
-    # Convert the element name filter to lowercase for case-insensitive comparison
-    element_name_filter = element_name_filter.lower()
-    
-    # Filter the selection based on the element name
-    filtered_selection = []
-    for element in selection:
-        element_name = element.Name
-        if element_name:
-            if exclude_mode and element_name_filter not in element_name.lower():
-                filtered_selection.append(element.Id)
-            elif not exclude_mode and element_name_filter in element_name.lower():
-                filtered_selection.append(element.Id)
-    
+
+    try:
+        includes, excludes, plain_includes = parse_query(element_name_filter)
+    except re.error as ex:
+        forms.alert("Invalid regular expression: {}".format(ex))
+        return
+
+    if scope == SCOPE_SELECTION:
+        candidates = selection
+    else:
+        candidates = collect_candidates(scope, includes, excludes, plain_includes)
+
+    # Filter each distinct name once rather than every element
+    filtered_selection = filter_index(build_name_index(candidates), includes, excludes)
+
     # Set the filtered selection
     selection.set_to(filtered_selection)
+    print("Selected {} elements.".format(len(filtered_selection)))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
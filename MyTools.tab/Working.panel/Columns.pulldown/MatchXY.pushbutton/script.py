@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
-from Autodesk.Revit.DB import XYZ
+from Autodesk.Revit.DB import XYZ, ElementTransformUtils, LocationPoint, LocationCurve
 from Autodesk.Revit.UI.Selection import ObjectType
-from pyrevit import revit
+from System.Collections.Generic import List
+from pyrevit import revit, forms, DB
+from revitfunctions.spatial import PointTree
 
 """
 Match XY coordinates of selected elements to a target element.
@@ -9,7 +11,10 @@ Match XY coordinates of selected elements to a target element.
 Instructions:
 1. Select one or more elements to be moved.
 2. Run the script.
-3. Select the target element to match XY coordinates.
+3. Select the target element to match XY coordinates, or select several
+   targets to snap each element to its nearest target.
+
+Curve based elements (beams, slanted columns) are matched by their start point.
 """
 
 
@@ -19,6 +24,14 @@ __author__ = "Adam Shaw"
 DOC = revit.doc
 UIDOC = revit.uidoc
 
+MODE_SINGLE = "Match One Target"
+MODE_NEAREST = "Snap to Nearest Target"
+
+# Elements further than this from every target are left where they are
+SNAP_DISTANCE = 1000 / 304.8  # 1m
+# Deltas are grouped after rounding to this, so elements move in shared calls
+DELTA_ROUNDING = 1 / 304.8 / 1000  # 0.001mm
+
 def get_selected_elements():
     """Get the currently selected elements."""
     return [DOC.GetElement(id) for id in UIDOC.Selection.GetElementIds()]
@@ -31,29 +44,135 @@ def pick_target_element():
     except:
         return None
 
-def update_element_location(element, target_location):
-    """Update the XY location of an element to match the target location."""
-    if hasattr(element.Location, 'Point'):
-        current_location = element.Location.Point
-        new_location = XYZ(target_location.X, target_location.Y, current_location.Z)
-        element.Location.Move(new_location - current_location)
+def pick_target_elements():
+    """Prompt user to pick several target elements."""
+    try:
+        target_refs = UIDOC.Selection.PickObjects(ObjectType.Element, 'Select target elements')
+        return [DOC.GetElement(x.ElementId) for x in target_refs]
+    except:
+        return []
+
+def get_location_point(element):
+    """
+    Get the point used to match an element's XY location.
+
+    Args:
+        element (Autodesk.Revit.DB.Element): The element.
+
+    Returns:
+        XYZ: The location point, or the start of the location curve, or None.
+    """
+    location = element.Location
+    if isinstance(location, LocationPoint):
+        return location.Point
+    if isinstance(location, LocationCurve):
+        return location.Curve.GetEndPoint(0)
+    return None
+
+def get_move_delta(current_location, target_location):
+    """Get the XY move from the current location to the target, ignoring Z."""
+    return XYZ(target_location.X - current_location.X, target_location.Y - current_location.Y, 0)
+
+def group_moves(moves):
+    """
+    Group elements by the distance they are moved.
+
+    Args:
+        moves (list): (element id, delta XYZ) for each element.
+
+    Returns:
+        dict: Rounded (dx, dy) mapped to (delta XYZ, list of element ids).
+    """
+    groups = {}
+    for element_id, delta in moves:
+        if delta.GetLength() < DELTA_ROUNDING:
+            continue
+        key = (int(round(delta.X / DELTA_ROUNDING)), int(round(delta.Y / DELTA_ROUNDING)))
+        groups.setdefault(key, (delta, []))[1].append(element_id)
+    return groups
+
+def move_elements(moves):
+    """
+    Move elements, with one MoveElements call per distinct delta.
+
+    Must be called inside a transaction.
+
+    Args:
+        moves (list): (element id, delta XYZ) for each element.
+
+    Returns:
+        int: The number of elements moved.
+    """
+    moved = 0
+    for delta, element_ids in group_moves(moves).values():
+        ElementTransformUtils.MoveElements(DOC, List[DB.ElementId](element_ids), delta)
+        moved += len(element_ids)
+    return moved
+
+def plan_single_target(elements, target_location):
+    """Get the move of each element to a single target location."""
+    moves = []
+    for elem in elements:
+        current_location = get_location_point(elem)
+        if current_location is not None:
+            moves.append((elem.Id, get_move_delta(current_location, target_location)))
+    return moves
+
+def plan_nearest_targets(elements, targets):
+    """
+    Get the move of each element to its nearest target.
+
+    Args:
+        elements (list): The elements to move.
+        targets (list): The target elements.
+
+    Returns:
+        list: (element id, delta XYZ) for each element within SNAP_DISTANCE of a target.
+    """
+    target_points = {}
+    for target in targets:
+        point = get_location_point(target)
+        if point is not None:
+            target_points[target.Id.IntegerValue] = point
+    tree = PointTree((key, point.X, point.Y) for key, point in target_points.items())
+
+    moves = []
+    for elem in elements:
+        current_location = get_location_point(elem)
+        if current_location is None or elem.Id.IntegerValue in target_points:
+            continue
+        key, _ = tree.nearest(current_location.X, current_location.Y, SNAP_DISTANCE)
+        if key is not None:
+            moves.append((elem.Id, get_move_delta(current_location, target_points[key])))
+    return moves
 
 def main():
     selected_elements = get_selected_elements()
     if not selected_elements:
-        revit.forms.alert("No elements selected. Please select elements and run the script again.")
+        forms.alert("No elements selected. Please select elements and run the script again.")
         return
 
-    target_element = pick_target_element()
-    if not target_element:
-        revit.forms.alert("No target element selected. Operation cancelled.")
+    mode = forms.alert("How should the elements be matched?", options=[MODE_SINGLE, MODE_NEAREST])
+    if not mode:
         return
 
-    target_location = target_element.Location.Point
+    if mode == MODE_SINGLE:
+        target_element = pick_target_element()
+        if not target_element or get_location_point(target_element) is None:
+            forms.alert("No target element selected. Operation cancelled.")
+            return
+        moves = plan_single_target(selected_elements, get_location_point(target_element))
+    else:
+        target_elements = pick_target_elements()
+        if not target_elements:
+            forms.alert("No target elements selected. Operation cancelled.")
+            return
+        moves = plan_nearest_targets(selected_elements, target_elements)
 
     with revit.Transaction("Match XY Coordinates"):
-        for elem in selected_elements:
-            update_element_location(elem, target_location)
+        moved = move_elements(moves)
+
+    print("Moved {} of {} elements.".format(moved, len(selected_elements)))
 
 if __name__ == "__main__":
     main()
@@ -1,61 +1,129 @@
 """
 Find all door elements in the active section or elevation view, filter out doors not parallel with the view's plane,
 tag the parallel doors, and move the tags to 200mm from the top of each door.
+Doors already tagged in the view are skipped. Run from a non-section view to pick several sections/elevations at once.
 """
 
 from pyrevit import revit, DB, forms
+from revitfunctions.tags import build_tag_index, is_tagged_in_view
 
 __title__ = "Tag Doors in \'Elevation\'"
 __author__ = "Adam Shaw"
 
+TAG_OFFSET = 250 / 304.8  # 250mm below the top of the door
 
-def is_door_parallel_to_view(door, view):
-    """Check if a door is parallel to the given view's plane."""
-    door_normal = door.FacingOrientation.Normalize()
-    view_normal = view.ViewDirection.CrossProduct(DB.XYZ.BasisZ).Normalize()
-    return abs(door_normal.DotProduct(view_normal)) < 0.01
 
+def get_view_normal(view):
+    """Get the horizontal normal of the view's plane, in plan."""
+    return view.ViewDirection.CrossProduct(DB.XYZ.BasisZ).Normalize()
 
-def tag_parallel_doors(doors, view):
-    """Tag the given doors in the specified view and move the tags."""
-    tag_type_id = next((t.Id for t in DB.FilteredElementCollector(revit.doc)
-                        .OfCategory(DB.BuiltInCategory.OST_DoorTags)
-                        .WhereElementIsElementType()), None)
 
-    if not tag_type_id:
-        forms.alert("No door tag types found in the project.")
-        return
+def is_door_parallel_to_view(door, view_normal):
+    """Check if a door is parallel to a view's plane, given the view normal."""
+    door_normal = door.FacingOrientation.Normalize()
+    return abs(door_normal.DotProduct(view_normal)) < 0.01
+
 
-    with revit.Transaction("Tag Parallel Doors"):
-        for door in doors:
-            bbox = door.get_BoundingBox(view)
-            offset = 250 / 304.8
-            door_loc_pt = door.Location.Point
-            tag_pt = DB.XYZ(door_loc_pt.X, door_loc_pt.Y, bbox.Max.Z - offset)
-            DB.IndependentTag.Create(revit.doc, tag_type_id, view.Id,
-                                     DB.Reference(door), False,
-                                     DB.TagOrientation.Horizontal, tag_pt)
+def get_door_tag_type_id():
+    return next((t.Id for t in DB.FilteredElementCollector(revit.doc)
+                 .OfCategory(DB.BuiltInCategory.OST_DoorTags)
+                 .WhereElementIsElementType()), None)
+
+
+def plan_door_tags(view, tag_index):
+    """
+    Work out the tag point of every untagged, parallel door in a view.
+
+    Args:
+        view (DB.ViewSection): The section or elevation view.
+        tag_index (dict): Tag index from revitfunctions.tags.build_tag_index.
+
+    Returns:
+        list: (door, tag point) for each door to tag.
+    """
+    view_normal = get_view_normal(view)
+
+    plan = []
+    for door in (DB.FilteredElementCollector(revit.doc, view.Id)
+                 .OfCategory(DB.BuiltInCategory.OST_Doors)
+                 .WhereElementIsNotElementType()):
+        if is_tagged_in_view(tag_index, door.Id, view.Id):
+            continue
+        if not is_door_parallel_to_view(door, view_normal):
+            continue
+        bbox = door.get_BoundingBox(view)
+        if not bbox:
+            continue
+        door_loc_pt = door.Location.Point
+        plan.append((door, DB.XYZ(door_loc_pt.X, door_loc_pt.Y, bbox.Max.Z - TAG_OFFSET)))
+    return plan
+
+
+def tag_parallel_doors(view_plans, tag_type_id):
+    """
+    Tag the planned doors in all views in one transaction.
+
+    Args:
+        view_plans (list): (view, output of plan_door_tags) for each view.
+        tag_type_id (DB.ElementId): The door tag type.
+
+    Returns:
+        int: The number of tags created.
+    """
+    total = sum(len(plan) for _, plan in view_plans)
+    counter = 0
+    with forms.ProgressBar(title="Tagging Doors") as pb:
+        with revit.Transaction("Tag Parallel Doors"):
+            for view, plan in view_plans:
+                for door, tag_pt in plan:
+                    DB.IndependentTag.Create(revit.doc, tag_type_id, view.Id,
+                                             DB.Reference(door), False,
+                                             DB.TagOrientation.Horizontal, tag_pt)
+                counter += len(plan)
+                pb.update_progress(counter, total)
+    return counter
+
+
+def is_section_view(view):
+    return isinstance(view, DB.ViewSection) and not view.IsTemplate
 
 
 def main():
     """Main function to execute the script logic."""
     active_view = revit.active_view
 
-    if not isinstance(active_view, DB.ViewSection):
-        forms.alert("The active view must be a section or elevation view.")
+    if is_section_view(active_view):
+        views = [active_view]
+    else:
+        views = forms.select_views(
+            title="Select Sections/Elevations",
+            button_name="Tag Doors",
+            multiple=True,
+            filterfunc=is_section_view,
+        )
+        if not views:
+            return
+
+    tag_type_id = get_door_tag_type_id()
+    if not tag_type_id:
+        forms.alert("No door tag types found in the project.")
         return
 
-    doors = [d for d in DB.FilteredElementCollector(revit.doc, active_view.Id)
-             .OfCategory(DB.BuiltInCategory.OST_Doors)
-             .WhereElementIsNotElementType()
-             if is_door_parallel_to_view(d, active_view)]
+    tag_index = build_tag_index(revit.doc)
+    view_plans = [(view, plan_door_tags(view, tag_index)) for view in views]
+    view_plans = [(view, plan) for view, plan in view_plans if plan]
 
-    if not doors:
-        forms.alert("No parallel doors found in the active view.")
+    if not view_plans:
+        forms.alert("No untagged parallel doors found in the selected views.")
         return
 
-    tag_parallel_doors(doors, active_view)
+    tag_count = tag_parallel_doors(view_plans, tag_type_id)
+
+    if len(views) > 1:
+        print("Tagged {} doors across {} of {} views:".format(tag_count, len(view_plans), len(views)))
+        for view, plan in view_plans:
+            print("  {} - {}".format(view.Name, len(plan)))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
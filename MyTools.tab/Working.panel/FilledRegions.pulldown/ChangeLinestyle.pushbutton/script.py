@@ -1,19 +1,16 @@
 from pyrevit import revit, DB, forms
+from revitfunctions.linestyles import build_line_style_catalogue, set_filled_region_line_style
 
 # Initialization
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
 
-# Retrieve all line styles using PyRevit's built-in function
-lineStyles = revit.query.get_line_styles()
+SCOPE_SELECTION = 'Selection'
+SCOPE_VIEW = 'Same Types in View'
+SCOPE_MODEL = 'Same Types in Model'
 
-# Find the "Invisible Lines" GraphicsStyle
-for gs in DB.FilteredElementCollector(doc).OfClass(DB.GraphicsStyle).WhereElementIsNotElementType():
-    if gs.GraphicsStyleCategory.Id == DB.ElementId(DB.BuiltInCategory.OST_InvisibleLines):
-        lineStyles.append(gs)
-
-# Prepare a dictionary for user selection, mapping style names to GraphicsStyle elements
-lineStyleDict = {style.Name: style for style in lineStyles}
+# Line styles by name, read from the Lines subcategories
+lineStyleDict = build_line_style_catalogue(doc)
 
 selectedStyleName = forms.SelectFromList.show(sorted(lineStyleDict.keys()),"Select Line Style",600, 300,button_name='Select Line Style')
 
@@ -22,13 +19,31 @@ if not selectedStyleName:
     # User cancelled the form or didn't select anything
     forms.alert('No line style selected. Operation cancelled.', exitscript=True)
 
-selectedStyle = lineStyleDict[selectedStyleName].Id
+selectedStyle = lineStyleDict[selectedStyleName]
 
 # Get the selected filled regions
-selectedElements = [doc.GetElement(id) for id in uidoc.Selection.GetElementIds()]
-
-with revit.Transaction("Set Lines to Invisible"):
-    for filledRegion in selectedElements:                      
-        # Iterate through sketch lines and set their style to "Invisible Lines"
-        # Set the line style to Invisible Lines using SetLineStyleId method
-        filledRegion.SetLineStyleId(selectedStyle)
\ No newline at end of file
+selectedElements = [el for el in revit.get_selection() if isinstance(el, DB.FilledRegion)]
+
+if not selectedElements:
+    forms.alert('Please select at least one filled region.', exitscript=True)
+
+scope = forms.alert('Apply the line style to:', options=[SCOPE_SELECTION, SCOPE_VIEW, SCOPE_MODEL])
+if not scope:
+    forms.alert('No scope selected. Operation cancelled.', exitscript=True)
+
+if scope == SCOPE_SELECTION:
+    targetElements = selectedElements
+else:
+    # Every filled region sharing a type with the selection
+    typeIds = set(el.GetTypeId().IntegerValue for el in selectedElements)
+    if scope == SCOPE_VIEW:
+        collector = DB.FilteredElementCollector(doc, doc.ActiveView.Id)
+    else:
+        collector = DB.FilteredElementCollector(doc)
+    targetElements = [el for el in collector.OfClass(DB.FilledRegion)
+                      if el.GetTypeId().IntegerValue in typeIds]
+
+with revit.Transaction("Set Filled Region Line Style"):
+    updated, skipped = set_filled_region_line_style(targetElements, selectedStyle)
+
+print("Updated {} filled regions, {} already used {}.".format(updated, skipped, selectedStyleName))
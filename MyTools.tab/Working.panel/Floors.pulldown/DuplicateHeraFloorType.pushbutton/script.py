@@ -12,6 +12,7 @@ Usage:
 4. The script will create a new floor type with the specified thickness.
 """
 
+from System.Collections.Generic import List
 from pyrevit import revit, DB, forms
 from pyrevit.revit.db import query
 from revitfunctions.basics import mm_to_feet, feet_to_mm
@@ -37,28 +38,78 @@ def get_new_thickness(non_fold_floors):
     return diff
 
 
-def duplicate_floor_type(floor, new_thickness):
-    floor_type = floor.FloorType
-    floor_name = floor.Name
-    thickness_param = floor.get_Parameter(DB.BuiltInParameter.FLOOR_ATTR_THICKNESS_PARAM)
-    floor_thickness = round(feet_to_mm(thickness_param.AsDouble()), 0)
+def get_floor_type_key(floor_type, name):
+    """Key a floor type by category and name, as floors and foundation slabs can share names."""
+    return (floor_type.Category.Id.IntegerValue, name)
+
+
+def get_floor_types_by_name(doc):
+    """Map the category and name of all floor types in the document to the types."""
+    floor_types = DB.FilteredElementCollector(doc).OfClass(DB.FloorType).ToElements()
+    return dict(
+        (get_floor_type_key(floor_type, query.get_name(floor_type)), floor_type)
+        for floor_type in floor_types
+    )
+
+
+def get_new_floor_name(floor_name, floor_thickness, new_thickness):
     thickness_str = str(int(floor_thickness))
     thickness_index = floor_name.find(thickness_str)
     newthickness_str = format(new_thickness,'.0f')
     if thickness_index != -1:
-        new_floor_name = floor_name[:thickness_index] + newthickness_str + floor_name[thickness_index + len(thickness_str):]
-    else:
-        new_floor_name = floor_name + " - " + newthickness_str
-    existing_floor_types = query.get_family_symbol("Floor", new_floor_name)
-    if existing_floor_types:
-        return existing_floor_types[0]
-    else:
-        new_floor_type = floor_type.Duplicate(new_floor_name)
-        compound_structure = new_floor_type.GetCompoundStructure()
-        if compound_structure and compound_structure.LayerCount > 0:
-            compound_structure.SetLayerWidth(0, mm_to_feet(new_thickness))
-            new_floor_type.SetCompoundStructure(compound_structure)
-        return new_floor_type
+        return floor_name[:thickness_index] + newthickness_str + floor_name[thickness_index + len(thickness_str):]
+    return floor_name + " - " + newthickness_str
+
+
+def duplicate_floor_type(floor, new_thickness, floor_types):
+    """
+    Get the floor type matching the floor's type at a new thickness, creating it if required.
+
+    Args:
+        floor (DB.Floor): A floor of the source floor type.
+        new_thickness (float): The new thickness in mm.
+        floor_types (dict): Floor types by (category id, name), updated with any new type.
+
+    Returns:
+        DB.FloorType: The floor type at the new thickness.
+    """
+    floor_type = floor.FloorType
+    thickness_param = floor.get_Parameter(DB.BuiltInParameter.FLOOR_ATTR_THICKNESS_PARAM)
+    floor_thickness = round(feet_to_mm(thickness_param.AsDouble()), 0)
+    new_floor_name = get_new_floor_name(floor.Name, floor_thickness, new_thickness)
+    key = get_floor_type_key(floor_type, new_floor_name)
+    if key in floor_types:
+        return floor_types[key]
+    new_floor_type = floor_type.Duplicate(new_floor_name)
+    compound_structure = new_floor_type.GetCompoundStructure()
+    if compound_structure and compound_structure.LayerCount > 0:
+        compound_structure.SetLayerWidth(0, mm_to_feet(new_thickness))
+        new_floor_type.SetCompoundStructure(compound_structure)
+    floor_types[key] = new_floor_type
+    return new_floor_type
+
+
+def update_floor_types(floors, new_thickness):
+    """
+    Move the floors onto types of the new thickness, one type per source floor type.
+
+    Args:
+        floors (list): The DB.Floor elements to update.
+        new_thickness (float): The new thickness in mm.
+    """
+    doc = revit.doc
+    floor_types = get_floor_types_by_name(doc)
+
+    floor_groups = {}
+    for floor in floors:
+        floor_groups.setdefault(floor.GetTypeId().IntegerValue, []).append(floor)
+
+    for group in floor_groups.values():
+        new_floor_type = duplicate_floor_type(group[0], new_thickness, floor_types)
+        if new_floor_type.Id == group[0].GetTypeId():
+            continue
+        floor_ids = List[DB.ElementId]([floor.Id for floor in group])
+        DB.Element.ChangeTypeId(doc, floor_ids, new_floor_type.Id)
 
 
 def main():
@@ -72,8 +123,7 @@ def main():
                 try:
                     new_thickness = float(new_thickness)
                     with revit.Transaction("Duplicate Floor Types"):
-                        for floor in fold_floors:
-                            floor.FloorType = duplicate_floor_type(floor, new_thickness)
+                        update_floor_types(fold_floors, new_thickness)
                 except ValueError:
                     forms.alert("Invalid thickness value. Please enter a valid number.")
         elif not fold_floors and non_fold_floors:
@@ -82,15 +132,13 @@ def main():
                 try:
                     new_thickness = float(new_thickness)
                     with revit.Transaction("Duplicate Floor Types"):
-                        for floor in non_fold_floors:
-                            floor.FloorType = duplicate_floor_type(floor, new_thickness)
+                        update_floor_types(non_fold_floors, new_thickness)
                 except ValueError:
                     forms.alert("Invalid thickness value. Please enter a valid number.")
         elif fold_floors and len(non_fold_floors) == 2:
             new_thickness = get_new_thickness(non_fold_floors)
             with revit.Transaction("Update Fold Floor Depth"):
-                for floor in fold_floors:
-                    floor.FloorType = duplicate_floor_type(floor, new_thickness)
+                update_floor_types(fold_floors, new_thickness)
         else:
             forms.alert("Invalid selection. Select either only FOLDS or non-FOLDS or FOLDS and 2 non-FOLDS")
 
@@ -6,7 +6,8 @@ The script will process each slab element, group the CurveArrays in its sketch,
 
 from System.Collections.Generic import List
 from pyrevit import revit, DB, forms
-from Autodesk.Revit.DB import GeometryCreationUtilities, ElementCategoryFilter, ElementClassFilter, LogicalAndFilter, BuiltInCategory, Sketch, SketchPlane
+from Autodesk.Revit.DB import ElementCategoryFilter, ElementClassFilter, LogicalAndFilter, BuiltInCategory, Sketch, SketchPlane
+from revitfunctions.polygons import Polygon, tessellate_curves, group_by_containment
 
 __title__ = "Split Slabs"
 __author__ = "Adam Shaw"
@@ -15,39 +16,6 @@ DOC = revit.doc
 UIDOC = revit.uidoc
 
 
-def create_face_from_curve_array(curve_array):
-    # Create a curve loop from the curve array
-    curve_loop = DB.CurveLoop.Create(curve_array)
-
-    # Create an IList of CurveLoop objects
-    curve_loops = List[DB.CurveLoop]()
-    curve_loops.Add(curve_loop)
-
-    # Define the extrusion direction and distance
-    extrusion_dir = DB.XYZ(0, 0, 1)  # Extrude in the positive Z direction
-    extrusion_dist = 10 / 304.8  # 10 mm converted to feet
-
-    solid = None
-    with revit.Transaction("Create Extrusion"):
-        try:
-            # Create a solid by extruding the curve loops
-            solid = GeometryCreationUtilities.CreateExtrusionGeometry(
-                curve_loops, extrusion_dir, extrusion_dist
-            )
-        except Exception as ex:
-            raise Exception("Failed to create extrusion. " + str(ex))
-
-    bottom_face = None
-    z_vector = DB.XYZ(0, 0, -1)
-
-    for face in solid.Faces:
-        if face.FaceNormal.IsAlmostEqualTo(z_vector):
-            bottom_face = face
-            break
-
-    return bottom_face
-
-
 def validate_selection(selection):
     if not selection:
         forms.alert("Please select at least one slab element.")
@@ -72,103 +40,125 @@ def group_curve_arrays_by_containment(slab_element):
     # Get the profile of the sketch
     profile = sketch_element.Profile
 
-    # Create a dictionary to store curve arrays and their corresponding faces
-    curve_array_faces = {}
-
-    # Iterate through the curves in the profile
+    # Tessellate each curve array once into a 2D polygon
+    polygons = []
     for curve_array in profile:
         if isinstance(curve_array, DB.CurveArray):
-            # Convert the CurveArray to a list of curves
-            curves = []
-            for curve in curve_array:
-                curves.append(curve)
+            polygons.append(Polygon(tessellate_curves(curve_array), curve_array))
 
-            # Create a face from the list of curves
-            face = create_face_from_curve_array(curves)
-            curve_array_faces[curve_array] = face
+    # Group outer boundaries with the holes directly inside them
+    grouped_curve_arrays = []
+    for group in group_by_containment(polygons):
+        grouped_curve_arrays.append([polygon.source for polygon in group])
 
-    # Sort the curve arrays based on the area of their faces (largest to smallest)
-    sorted_curve_arrays = sorted(
-        curve_array_faces.items(), key=lambda x: x[1].Area, reverse=True
-    )
+    return grouped_curve_arrays
 
-    # Create a list to store the grouped curve arrays
-    grouped_curve_arrays = []
 
-    # Iterate through the sorted curve arrays, popping off the largest one each time
-    while sorted_curve_arrays:
-        (current_curve_array, current_face) = sorted_curve_arrays.pop(
-            0
-        )  # Pop the largest curve array
-        current_group = [current_curve_array]  # Start a new group with the largest
-
-        # Iterate through the remaining curve arrays
-        i = 0
-        while i < len(sorted_curve_arrays):
-            (other_curve_array, other_face) = sorted_curve_arrays[i]
-            points_on_face = False
-
-            # Check if any points from the other curve array are inside the current face
-            for curve in other_curve_array:
-                start_point = curve.GetEndPoint(0)
-                start_point_2d = DB.XYZ(start_point.X, start_point.Y, 0)
-                try:
-                    temp_UV = current_face.Project(start_point_2d).UVPoint
-                    if current_face.IsInside(temp_UV):
-                        points_on_face = True
-                    break
-                except:
-                    continue
-
-            # If points are inside, add to the current group and remove from the sorted list
-            if points_on_face:
-                current_group.append(other_curve_array)
-                sorted_curve_arrays.pop(i)
-            else:
-                i += 1  # Move to the next curve array if not inside
-
-        grouped_curve_arrays.append(current_group)  # Add the completed group
+def get_curve_loop_groups(slab_element):
+    cl_list = []
+    for group in group_curve_arrays_by_containment(slab_element):
+        c_list = []
+        for curvearr in group:
+            templist = []
+            for lines in curvearr:
+                templist.append(lines)
+            c_list.append(DB.CurveLoop.Create(templist))
+        cl_list.append(c_list)
+    return cl_list
 
-    return grouped_curve_arrays
 
+def plan_slab_splits(slab_elements):
+    """
+    Work out the new floor boundaries for every slab before touching the model.
 
-def create_floors_from_curve_groups(
-    curve_loops, level, floor_type
-):  # Added level and floor_type as arguments
-    floors = []
-    with revit.Transaction("Create Floors"):
-        try:
-            new_floor = DB.Floor.Create(
-                DOC, curve_loops, floor_type, level, True, None, 0.0
-            )
-            floors.append(new_floor)
-        except Exception as ex:
-            print("Failed to create floor. " + str(ex))
-    return floors
-
-
-def process_slab_elements(slab_elements):
-    deleted_ids = []
+    Args:
+        slab_elements (list): The DB.Floor elements to split.
+
+    Returns:
+        list: (slab, level id, floor type id, list of curve loop groups) for every
+            slab that splits into more than one floor.
+    """
+    plan = []
     for slab_element in slab_elements:
-        # Get level and floor type from each slab element
-        level = slab_element.LevelId
-        floor_type = slab_element.FloorType.Id
-
-        grouped_curve_arrays = group_curve_arrays_by_containment(slab_element)
-        cl_list = []
-        for group in grouped_curve_arrays:
-            c_list = []
-            for curvearr in group:
-                templist = []
-                for lines in curvearr:
-                    templist.append(lines)
-                c_list.append(DB.CurveLoop.Create(templist))
-            cl_list.append(c_list)
-        with revit.Transaction("Deleting Old Floors"):
-            deleted_ids.append(DOC.Delete(slab_element.Id))
-
-        for curveloops in cl_list:
-            create_floors_from_curve_groups(curveloops, level, floor_type)
+        cl_list = get_curve_loop_groups(slab_element)
+        if len(cl_list) < 2:
+            continue
+        plan.append((slab_element, slab_element.LevelId, slab_element.FloorType.Id, cl_list))
+    return plan
+
+
+def summarise_dependent_elements(slab_elements, element_filter):
+    """
+    Count the elements that will be deleted along with the slabs.
+
+    Args:
+        slab_elements (list): The DB.Floor elements to be deleted.
+        element_filter (DB.ElementFilter): Filter passed to GetDependentElements.
+
+    Returns:
+        dict: (category name, owner view name) mapped to the number of elements.
+    """
+    slab_ids = set(x.Id.IntegerValue for x in slab_elements)
+    view_names = {}
+    summary = {}
+    for x in slab_elements:
+        for y in x.GetDependentElements(element_filter):
+            if y.IntegerValue in slab_ids:
+                continue
+            item = DOC.GetElement(y)
+            if item is None or item.Name == "":
+                continue
+            category_name = item.Category.Name if item.Category else "No Category"
+            owner_view_id = item.OwnerViewId
+            if owner_view_id.IntegerValue not in view_names:
+                owner_view = DOC.GetElement(owner_view_id)
+                view_names[owner_view_id.IntegerValue] = owner_view.Name if owner_view else ""
+            key = (category_name, view_names[owner_view_id.IntegerValue])
+            summary[key] = summary.get(key, 0) + 1
+    return summary
+
+
+def print_dependent_summary(summary):
+    if not summary:
+        return
+    lines = ["Deleted dependent elements:"]
+    for (category_name, view_name), count in sorted(summary.items()):
+        if view_name:
+            lines.append("  {} x {}         from view: {}".format(count, category_name, view_name))
+        else:
+            lines.append("  {} x {}".format(count, category_name))
+    print("\n".join(lines))
+
+
+def process_slab_elements(plan):
+    """
+    Create the split floors and delete the original slabs in one transaction.
+
+    The floors are created before anything is deleted, and the transaction is
+    rolled back if any floor cannot be created, so no slab loses its geometry.
+
+    Args:
+        plan (list): Output of plan_slab_splits.
+
+    Returns:
+        list: The ids of all deleted elements.
+    """
+    floors = []
+    with revit.Transaction("Split Slabs"):
+        for slab_element, level, floor_type, cl_list in plan:
+            for curveloops in cl_list:
+                try:
+                    floors.append(
+                        DB.Floor.Create(DOC, curveloops, floor_type, level, True, None, 0.0)
+                    )
+                except Exception as ex:
+                    # Leaving the transaction with an exception rolls everything back
+                    raise Exception("Failed to create floor from slab {}, no slabs were split. {}".format(
+                        slab_element.Id.IntegerValue, ex))
+
+        slab_ids = List[DB.ElementId]([slab_element.Id for slab_element, _, _, _ in plan])
+        deleted_ids = list(DOC.Delete(slab_ids))
+    print("Split {} slabs into {} floors.".format(len(plan), len(floors)))
     return deleted_ids
 
 def main():
@@ -184,17 +174,16 @@ def main():
     combined_filter = LogicalAndFilter([category_filter1, category_filter2, sketch_filter, sketch_plane_filter])
 
     try:
-        with revit.TransactionGroup("Split Slabs"):
-            slab_elements = get_slab_elements(selection)
-            for x in slab_elements:
-                dependent_elements = x.GetDependentElements(combined_filter)
-                for item in [DOC.GetElement(y) for y in dependent_elements]:
-                    if item.Name != "":
-                        try:
-                            print("Deleted: "+item.Name+" ("+item.Category.Name+")         from view: "+ DOC.GetElement(item.OwnerViewId).Name)
-                        except:
-                            print("Deleted: "+item.Name+" ("+item.Category.Name+")")
-            process_slab_elements(slab_elements)
+        slab_elements = get_slab_elements(selection)
+        plan = plan_slab_splits(slab_elements)
+        if not plan:
+            if slab_elements:
+                forms.alert("None of the selected slabs have separate boundaries to split.")
+            return
+
+        summary = summarise_dependent_elements([x[0] for x in plan], combined_filter)
+        process_slab_elements(plan)
+        print_dependent_summary(summary)
 
     except Exception as e:
         print("An error occurred:", str(e))
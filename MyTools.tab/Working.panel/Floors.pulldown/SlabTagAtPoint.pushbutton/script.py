@@ -1,14 +1,22 @@
 """
 This script creates a floor tag at the selected point on a slab element in the active Revit view.
-To use this script, run it and then click on a point on a slab element in the Revit view.
+To use this script, run it and then click on points on slab elements in the Revit view.
+Press Esc to finish; the tags are created together once picking ends.
+
+Alternatively, tag every untagged floor in the view at a point well inside its outline.
 """
 
-from pyrevit import revit, DB, UI
+from pyrevit import revit, DB, UI, forms
 from Autodesk.Revit import Exceptions
+from revitfunctions.polygons import Polygon, tessellate_curves, group_by_containment, get_inscribed_point
+from revitfunctions.tags import build_tag_index, is_tagged_in_view
 
 __title__ = "Create Floor Tag at Selected Point (Slab Only)"
 __author__ = "Adam Shaw"
 
+MODE_PICK = "Pick Points"
+MODE_ALL = "All Untagged Floors in View"
+
 
 class SlabSelectionFilter(UI.Selection.ISelectionFilter):
     def AllowElement(self, elem):
@@ -18,15 +26,105 @@ class SlabSelectionFilter(UI.Selection.ISelectionFilter):
         return True
 
 
-def create_floor_tag(doc, view, floor, point):
-    tag_type_id = DB.FilteredElementCollector(doc).OfCategory(
-        DB.BuiltInCategory.OST_FloorTags).FirstElementId()
+def get_floor_tag_type_id(doc):
+    """Get the default floor tag type, or the first one loaded."""
+    category_id = DB.ElementId(DB.BuiltInCategory.OST_FloorTags)
+    tag_type_id = doc.GetDefaultFamilyTypeId(category_id)
+    if tag_type_id == DB.ElementId.InvalidElementId:
+        tag_type_id = DB.FilteredElementCollector(doc).OfCategory(
+            DB.BuiltInCategory.OST_FloorTags).WhereElementIsElementType().FirstElementId()
+    return tag_type_id
+
+
+def create_floor_tag(doc, view, tag_type_id, floor, point):
+    tag = DB.IndependentTag.Create(doc, tag_type_id, view.Id, DB.Reference(floor), False,
+                                   DB.TagOrientation.Horizontal, point)
+    return tag
+
+
+def create_floor_tags(doc, view, tag_type_id, queue):
+    """
+    Create every queued floor tag in a single transaction.
+
+    Each tag is created in its own sub-transaction, so a tag Revit refuses is
+    rolled back and counted without losing the rest of the queue.
+
+    Args:
+        doc (DB.Document): The Revit document.
+        view (DB.View): The view to tag in.
+        tag_type_id (DB.ElementId): The floor tag type.
+        queue (list): (floor, point) for each tag.
+
+    Returns:
+        int: The number of tags that could not be created.
+    """
+    failed = 0
+    with revit.Transaction("Create Floor Tags"):
+        for floor, point in queue:
+            sub_transaction = DB.SubTransaction(doc)
+            sub_transaction.Start()
+            try:
+                create_floor_tag(doc, view, tag_type_id, floor, point)
+                sub_transaction.Commit()
+            except (Exceptions.ArgumentException, Exceptions.InvalidOperationException):
+                sub_transaction.RollBack()
+                failed += 1
+    return failed
+
+
+def pick_tag_points(uidoc):
+    """
+    Collect slab picks until the user presses Esc.
+
+    Returns:
+        list: (floor, point) for each pick.
+    """
+    doc = uidoc.Document
+    slab_filter = SlabSelectionFilter()
+    queue = []
+    while True:
+        try:
+            ref = uidoc.Selection.PickObject(UI.Selection.ObjectType.PointOnElement, slab_filter,
+                                             "Select a point on a slab element ({} queued, Esc to finish)"
+                                             .format(len(queue)))
+        except Exceptions.OperationCanceledException:
+            break
+        queue.append((doc.GetElement(ref.ElementId), ref.GlobalPoint))
+    return queue
+
+
+def get_floor_tag_point(doc, floor):
+    """
+    Get a tag point inside the largest outline of a floor, computed from its sketch.
+
+    Returns:
+        DB.XYZ: The tag point at the floor's top level.
+    """
+    polygons = []
+    for curve_array in doc.GetElement(floor.SketchId).Profile:
+        polygons.append(Polygon(tessellate_curves(curve_array)))
+    group = group_by_containment(polygons)[0]
+    (x, y), _ = get_inscribed_point(group)
+    z = floor.get_Parameter(DB.BuiltInParameter.STRUCTURAL_ELEVATION_AT_TOP).AsDouble()
+    return DB.XYZ(x, y, z)
 
-    if tag_type_id != DB.ElementId.InvalidElementId:
-        tag = DB.IndependentTag.Create(doc, tag_type_id, view.Id, DB.Reference(floor), False,
-                                 DB.TagOrientation.Horizontal, point)
-        return tag
-    return False
+
+def plan_untagged_floors(doc, view):
+    """
+    Work out a tag point for every floor in the view without a tag in that view.
+
+    Returns:
+        list: (floor, point) for each floor to tag.
+    """
+    tag_index = build_tag_index(doc, view.Id)
+    queue = []
+    for floor in (DB.FilteredElementCollector(doc, view.Id)
+                  .OfClass(DB.Floor)
+                  .WhereElementIsNotElementType()):
+        if is_tagged_in_view(tag_index, floor.Id, view.Id):
+            continue
+        queue.append((floor, get_floor_tag_point(doc, floor)))
+    return queue
 
 
 def main():
@@ -34,24 +132,32 @@ def main():
     doc = uidoc.Document
     view = doc.ActiveView
 
-    try:
-        while True:
-            try:
-                slab_filter = SlabSelectionFilter()
-                ref = uidoc.Selection.PickObject(UI.Selection.ObjectType.PointOnElement, slab_filter,
-                                                 "Select a point on a slab element")
-                floor = doc.GetElement(ref.ElementId)
-                point = ref.GlobalPoint
+    # Resolve the tag type once for the whole run
+    tag_type_id = get_floor_tag_type_id(doc)
+    if tag_type_id == DB.ElementId.InvalidElementId:
+        UI.TaskDialog.Show("Error", "No floor tag family is loaded.")
+        return
+
+    mode = forms.alert("Tag floors by:", options=[MODE_PICK, MODE_ALL])
+    if not mode:
+        return
+
+    if mode == MODE_PICK:
+        queue = pick_tag_points(uidoc)
+    else:
+        queue = plan_untagged_floors(doc, view)
 
-                with revit.Transaction("Create Floor Tag"):
-                    if not create_floor_tag(doc, view, floor, point):
-                        UI.TaskDialog.Show("Error", "Failed to create floor tag.")
-            except Exceptions.OperationCanceledException:
-                break
+    if not queue:
+        if mode == MODE_ALL:
+            UI.TaskDialog.Show("Floor Tags", "All floors in this view are already tagged.")
+        else:
+            UI.TaskDialog.Show("Cancelled", "Floor tag creation cancelled.")
+        return
 
-    except Exceptions.OperationCanceledException:
-        UI.TaskDialog.Show("Cancelled", "Floor tag creation cancelled.")
+    failed = create_floor_tags(doc, view, tag_type_id, queue)
+    if failed:
+        UI.TaskDialog.Show("Error", "Failed to create {} of {} floor tags.".format(failed, len(queue)))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,8 @@
+import os
+import shutil
+import threading
+import time
+
 from Autodesk.Revit.DB import (
     FilteredElementCollector,
     CADLinkType,
@@ -7,14 +12,21 @@ from pyrevit import forms, revit, script
 __title__ = "Update DWG paths"
 __author__ = "Adam Shaw"
 
+LOAD_DIRECT = "Load from folder"
+LOAD_STAGED = "Mirror to local folder first"
+
+# Number of threads copying files to the local mirror
+STAGING_THREADS = 4
+
 
 def select_cadlinktypes():
     # Collect all CADLinkType elements in the project
     cadlinktypes = FilteredElementCollector(revit.doc).OfClass(CADLinkType).ToElements()
 
-    # Create a dictionary with CADLinkType names and their corresponding elements
+    # Key by element id so links sharing a file name are all listed
     cadlinktype_dict = {
-        cadlinktype.Category.Name: cadlinktype for cadlinktype in cadlinktypes
+        "{} [{}]".format(cadlinktype.Category.Name, cadlinktype.Id.IntegerValue): cadlinktype
+        for cadlinktype in cadlinktypes
     }
 
     # Prompt the user to select the CADLinkTypes to load
@@ -32,6 +44,111 @@ def select_cadlinktypes():
     )
 
 
+def scan_folder(folder):
+    """
+    Index the files in a folder by lower case file name, in a single pass.
+
+    Args:
+        folder (str): The folder to scan.
+
+    Returns:
+        dict: Lower case file name mapped to (path, size, mtime).
+    """
+    index = {}
+    scandir = getattr(os, "scandir", None)
+    if scandir is not None:
+        for entry in scandir(folder):
+            if entry.is_file():
+                stat = entry.stat()
+                index[entry.name.lower()] = (entry.path, stat.st_size, stat.st_mtime)
+    else:
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                index[name.lower()] = (path, stat.st_size, stat.st_mtime)
+    return index
+
+
+def plan_link_loads(cadlinktypes, file_index):
+    """
+    Match each link to a file in the folder index before loading anything.
+
+    Args:
+        cadlinktypes (list): The CADLinkType elements to repath.
+        file_index (dict): Output of scan_folder.
+
+    Returns:
+        tuple: (list of (link, path, size, mtime) sorted smallest file first,
+            list of missing file names).
+    """
+    plan = []
+    missing = []
+    for cadlinktype in cadlinktypes:
+        filename = cadlinktype.Category.Name
+        match = file_index.get(filename.lower())
+        if match is None:
+            missing.append(filename)
+        else:
+            path, size, mtime = match
+            plan.append((cadlinktype, path, size, mtime))
+    plan.sort(key=lambda x: x[2])
+    return plan, missing
+
+
+def is_copy_current(src_size, src_mtime, dst_path):
+    """Check if a copy exists with the same size and modified time as its source."""
+    if not os.path.exists(dst_path):
+        return False
+    return os.path.getsize(dst_path) == src_size and abs(os.path.getmtime(dst_path) - src_mtime) < 2
+
+
+def stage_files(plan, stage_folder):
+    """
+    Copy the planned files into a local folder, skipping files already current.
+
+    Files are copied by several threads at once, as no Revit API calls are made.
+
+    Args:
+        plan (list): Output of plan_link_loads.
+        stage_folder (str): The local folder to copy into.
+
+    Returns:
+        tuple: (plan with paths pointing at the local copies, list of failed file names).
+    """
+    jobs = []
+    staged_plan = []
+    for cadlinktype, path, size, mtime in plan:
+        dst_path = os.path.join(stage_folder, os.path.basename(path))
+        staged_plan.append((cadlinktype, dst_path, size, mtime))
+        if not is_copy_current(size, mtime, dst_path):
+            jobs.append((path, dst_path))
+
+    failed = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not jobs:
+                    return
+                src_path, dst_path = jobs.pop()
+            try:
+                shutil.copy2(src_path, dst_path)
+            except Exception:
+                with lock:
+                    failed.append(os.path.basename(src_path))
+
+    threads = [threading.Thread(target=worker) for _ in range(STAGING_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    staged_plan = [x for x in staged_plan if os.path.basename(x[1]) not in failed]
+    return staged_plan, failed
+
+
 def main():
     # Get the selected CADLinkTypes
     selected_link_instances = select_cadlinktypes()
@@ -45,18 +162,53 @@ def main():
     if not new_folder:
         script.exit("No folder selected. Exiting script.")
 
-    print("Repathing to " + new_folder+"\\...")
+    # Check every file exists before loading anything
+    plan, missing = plan_link_loads(selected_link_instances, scan_folder(new_folder))
+    for filename in missing:
+        print(filename + " MISSING")
+
+    if not plan:
+        script.exit("None of the selected files were found. Exiting script.")
+
+    if missing:
+        if not forms.alert(
+            "{} of {} files could not be found. Load the rest?".format(
+                len(missing), len(selected_link_instances)
+            ),
+            yes=True,
+            no=True,
+        ):
+            script.exit()
+
+    mode = forms.alert("How should the links be loaded?", options=[LOAD_DIRECT, LOAD_STAGED])
+    if not mode:
+        script.exit()
+
+    if mode == LOAD_STAGED:
+        stage_folder = forms.pick_folder(title="Select the local folder to mirror the DWG files to")
+        if not stage_folder:
+            script.exit("No folder selected. Exiting script.")
+        start = time.time()
+        plan, failed = stage_files(plan, stage_folder)
+        for filename in failed:
+            print(filename + " COPY FAILED")
+        print("Mirrored to {} in {:.1f}s".format(stage_folder, time.time() - start))
+        load_folder = stage_folder
+    else:
+        load_folder = new_folder
+
+    print("Repathing to " + load_folder + "\\...")
 
-    # Iterate over each linked DWG instance
+    # Load the smallest files first so the largest don't hold up the rest
     with revit.Transaction("Update Linked DWG Locations"):
-        for instance in selected_link_instances:
+        for instance, fullfilepath, size, _ in plan:
             filename = instance.Category.Name
-            fullfilepath = new_folder + "\\" + filename
+            start = time.time()
             try:
                 instance.LoadFrom(fullfilepath)
-                print(filename + " SUCCEEDED")
-            except:
-                print(filename + " FAILED")
+                print("{} SUCCEEDED ({:.1f}s)".format(filename, time.time() - start))
+            except Exception:
+                print("{} FAILED ({:.1f}s)".format(filename, time.time() - start))
 
 
 if __name__ == "__main__":
@@ -8,15 +8,26 @@ __title__ = "Get Rebar Dir"
 
 from pyrevit import revit, DB, forms
 import math
+import time
 
 doc = revit.doc
 
+DIRECTION_PARAMETER = "Reinforcement Direction (Instance)"
+
+SCOPE_SELECTION = "Selection"
+SCOPE_VIEW = "All in View"
+SCOPE_MODEL = "All in Model"
+
+AXES_PROJECT = "Project X/Y"
+AXES_GRID = "Align to Grid"
+
+
 def get_xy_direction(rebar):
     """
-    Given a Rebar element, return the normalized direction vector (X, Y) 
+    Given a Rebar element, return the normalized direction vector (X, Y)
     of its first centerline segment.
     """
-    
+
     if not isinstance(rebar, DB.Structure.Rebar):
         return None
 
@@ -27,51 +38,153 @@ def get_xy_direction(rebar):
         DB.Structure.MultiplanarOption.IncludeOnlyPlanarCurves,
         0       # barPositionIndex
     )
-    
+
     if not curves or curves.Count == 0:
         return None
 
+    # The first segment with any length in plan decides the direction
     for curve in curves:
-        direction = curve.Direction
-
-        # Only proceed if both X and Y components are significant
-        if abs(direction.X) > 0.0001 or abs(direction.Y) > 0.0001:
-            start = curve.GetEndPoint(0)
-            end = curve.GetEndPoint(1)
-            dx = end.X - start.X
-            dy = end.Y - start.Y
-            length = math.sqrt(dx**2 + dy**2)
-            if length > 0:
-                return (dx/length, dy/length)
-            else:
-                return None
-
-def set_direction_parameter(rebar, direction):
+        start = curve.GetEndPoint(0)
+        end = curve.GetEndPoint(1)
+        dx = end.X - start.X
+        dy = end.Y - start.Y
+        length = math.sqrt(dx**2 + dy**2)
+        if length > 0.0001:
+            return (dx/length, dy/length)
+    return None
+
+
+def get_dominant_axis(vec, axis):
+    """
+    Classify a plan direction as "X" or "Y".
+
+    Args:
+        vec (tuple): Normalized (X, Y) direction of the rebar.
+        axis (tuple): Normalized (X, Y) direction treated as X, e.g. (1, 0).
+
+    Returns:
+        str: "X" or "Y".
+    """
+    along = vec[0] * axis[0] + vec[1] * axis[1]
+    across = vec[1] * axis[0] - vec[0] * axis[1]
+    return "X" if abs(along) >= abs(across) else "Y"
+
+
+def get_grid_axis():
+    """Ask for a grid and return its plan direction, or None if cancelled."""
+    grids = dict(
+        (grid.Name, grid)
+        for grid in DB.FilteredElementCollector(doc).OfClass(DB.Grid)
+        if isinstance(grid.Curve, DB.Line)
+    )
+    if not grids:
+        forms.alert("No straight grids found.", exitscript=True)
+
+    name = forms.SelectFromList.show(
+        sorted(grids.keys()), title="Select a grid to treat as X", button_name="Select Grid"
+    )
+    if not name:
+        return None
+    direction = grids[name].Curve.Direction
+    length = math.sqrt(direction.X**2 + direction.Y**2)
+    return (direction.X/length, direction.Y/length)
+
+
+def collect_rebar(scope):
     """
-    Sets the instance parameter "Reinforcement Direction (Instance)" to "X" or "Y".
+    Get the rebar to update.
+
+    Args:
+        scope (str): One of the SCOPE_* options.
+
+    Returns:
+        list: Rebar elements.
+    """
+    if scope == SCOPE_SELECTION:
+        return [x for x in revit.get_selection() if isinstance(x, DB.Structure.Rebar)]
+    if scope == SCOPE_VIEW:
+        collector = DB.FilteredElementCollector(doc, doc.ActiveView.Id)
+    else:
+        collector = DB.FilteredElementCollector(doc)
+    return list(collector.OfClass(DB.Structure.Rebar).WhereElementIsNotElementType())
+
+
+def plan_directions(rebars, axis):
     """
-    param = rebar.LookupParameter("Reinforcement Direction (Instance)")
-    if param and param.StorageType == DB.StorageType.String and not param.IsReadOnly:
-        param.Set(direction)
+    Classify each rebar and find the parameters that need changing.
+
+    Args:
+        rebars (list): Rebar elements.
+        axis (tuple): Normalized (X, Y) direction treated as X.
+
+    Returns:
+        tuple: (list of (parameter, direction) to write, dict of counts by result).
+    """
+    counts = {"X": 0, "Y": 0, "unchanged": 0, "no direction": 0, "no parameter": 0}
+    changes = []
+    definition = None
+
+    for rebar in rebars:
+        # Resolve the parameter by name once, then bind it by definition
+        if definition is None:
+            param = rebar.LookupParameter(DIRECTION_PARAMETER)
+            if param:
+                definition = param.Definition
+        else:
+            param = rebar.get_Parameter(definition)
+
+        if not param or param.StorageType != DB.StorageType.String or param.IsReadOnly:
+            counts["no parameter"] += 1
+            continue
+
+        vec = get_xy_direction(rebar)
+        if not vec:
+            counts["no direction"] += 1
+            continue
+
+        dominant = get_dominant_axis(vec, axis)
+        counts[dominant] += 1
+        if param.AsString() == dominant:
+            counts["unchanged"] += 1
+        else:
+            changes.append((param, dominant))
+
+    return changes, counts
+
 
 def main():
-    selection = revit.get_selection()
-
-    if not selection:
-        forms.alert("No elements selected. Please select rebar elements.", exitscript=True)
-
-    updated = []
-
-    with revit.Transaction("Set Reinforcement Direction"):
-        for i, elem in enumerate(selection):
-            vec = get_xy_direction(elem)
-            if vec:
-                dominant = "X" if abs(vec[0]) >= abs(vec[1]) else "Y"
-                set_direction_parameter(elem, dominant)
-                updated.append((i + 1, dominant))
-    
-    if not updated:
-        print("No valid Rebar directions found or parameters not set.")
+    scope = forms.alert("Set the direction of:", options=[SCOPE_SELECTION, SCOPE_VIEW, SCOPE_MODEL])
+    if not scope:
+        return
+
+    axes = forms.alert("Classify directions against:", options=[AXES_PROJECT, AXES_GRID])
+    if not axes:
+        return
+    axis = (1.0, 0.0)
+    if axes == AXES_GRID:
+        axis = get_grid_axis()
+        if not axis:
+            return
+
+    start = time.time()
+    rebars = collect_rebar(scope)
+    if not rebars:
+        forms.alert("No rebar found. Please select rebar elements.", exitscript=True)
+
+    changes, counts = plan_directions(rebars, axis)
+
+    if changes:
+        with revit.Transaction("Set Reinforcement Direction"):
+            for param, dominant in changes:
+                param.Set(dominant)
+
+    print("Checked {} rebar in {:.1f}s".format(len(rebars), time.time() - start))
+    print("X: {}, Y: {}".format(counts["X"], counts["Y"]))
+    print("Updated: {}, already correct: {}".format(len(changes), counts["unchanged"]))
+    if counts["no direction"] or counts["no parameter"]:
+        print("Skipped: {} with no plan direction, {} without a writable \"{}\"".format(
+            counts["no direction"], counts["no parameter"], DIRECTION_PARAMETER))
+
 
 if __name__ == "__main__":
     main()
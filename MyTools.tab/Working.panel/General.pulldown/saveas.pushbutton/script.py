@@ -5,18 +5,24 @@ CollaborationCache into C:\temp, naming it:
 copy_<project_title>.rvt
 
 Warn if the cached file is older than 5 minutes.
+Skip the copy if C:\temp already holds a current copy, and optionally keep
+timestamped snapshots of the previous copies (hard linked where possible).
 """
 
 import os
-import shutil
 import time
-from pyrevit import revit, DB
+from pyrevit import revit, DB, forms
+from revitfunctions.filecopy import snapshot_file
 
 __title__ = "Save Cloud Cache Copy"
 __author__ = "Adam Shaw"
 
 doc = revit.doc
 
+COPY_ONLY = "Copy"
+COPY_SNAPSHOT = "Copy and keep snapshots"
+SNAPSHOTS_TO_KEEP = 5
+
 
 def main():
     if not doc.IsWorkshared:
@@ -64,8 +70,24 @@ def main():
     dst_filename = "copy_{0}.rvt".format(safe_title)
     dst_path = os.path.join(dst_dir, dst_filename)
 
-    shutil.copy2(cache_file, dst_path)
-    print("Copied to {}".format(dst_path))
+    mode = forms.alert("Save the cached model copy:", options=[COPY_ONLY, COPY_SNAPSHOT])
+    if not mode:
+        return
+    keep = SNAPSHOTS_TO_KEEP if mode == COPY_SNAPSHOT else 0
+
+    start = time.time()
+    with forms.ProgressBar(title="Copying cached model ({value} of {max_value} MB)") as pb:
+        copied = snapshot_file(
+            cache_file,
+            dst_path,
+            keep=keep,
+            progress=lambda done, total: pb.update_progress(done // 1048576, total // 1048576),
+        )
+
+    if copied:
+        print("Copied to {} in {:.1f}s".format(dst_path, time.time() - start))
+    else:
+        print("Already up to date: {}".format(dst_path))
 
 
 if __name__ == "__main__":
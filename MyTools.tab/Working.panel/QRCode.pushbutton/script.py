@@ -98,12 +98,9 @@ def generate_qr_code(qr_data):
     for rect in rectangles:
         draw.rectangle([rect[0], rect[1]], fill=rect[2])
 
-    qr_pixels = qr_img.load()
-    overlay_pixels = overlay.load()
-    for y in range(H):
-        for x in range(W):
-            if qr_pixels[x, y] == black:
-                qr_pixels[x, y] = overlay_pixels[x, y]
+    # Mask of the dark modules, then copy the overlay through it in one operation
+    mask = qr_img.convert('L').point(lambda v: 255 if v == 0 else 0, mode='1')
+    qr_img.paste(overlay, (0, 0), mask)
 
     return qr_img
 
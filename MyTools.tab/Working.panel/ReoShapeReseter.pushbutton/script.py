@@ -1,6 +1,7 @@
 from rpw.ui.forms import TextInput
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import Element, Transaction
+from revitfunctions.reoshapes import get_reo_shapes
 
 uidoc = __revit__.ActiveUIDocument
 doc = __revit__.ActiveUIDocument.Document
@@ -12,42 +13,42 @@ _texttop = ""
 _textbtm = ""
 _textloc = 10000
 
-def set_parameter_by_name(element, parameterName, value):
-    element.LookupParameter(parameterName).Set(value)
-
-# convert units to mm coz revit retarded
-def convertunits(number):
-    return (number / 304.8)
+REQUIRED_FIELDS = (
+    "text_location",
+    "start_extent",
+    "end_extent",
+    "text_top_vis",
+    "text_btm_vis",
+    "extent_line_vis",
+    "text_top",
+    "text_btm",
+)
 
 # Select element from revit.
 selection = [doc.GetElement(x) for x in uidoc.Selection.GetElementIds()]
 
+# Resolve the 2019/2021 parameter names once per family type
+_shapes, _skipped = get_reo_shapes(selection, REQUIRED_FIELDS)
+
 # Start Transaction
 t.Start()
 
-for _detail in selection:
-    set_parameter_by_name(_detail, "Text Location", convertunits(_textloc))
-
-    try:
-        set_parameter_by_name(_detail, "Start Rebar Area Extents", convertunits(_startnew))
-        set_parameter_by_name(_detail, "End Rebar Area Extents", convertunits(_endnew))
-        set_parameter_by_name(_detail, "Text TOP On/Off", 0)
-        set_parameter_by_name(_detail, "Text BTM On/Off", 0)
-        set_parameter_by_name(_detail, "Extent Line On/Off",0)
-
-    except:
-        set_parameter_by_name(_detail, "LEFT Extent", convertunits(_startnew))
-        set_parameter_by_name(_detail, "RIGHT Extent", convertunits(_endnew))
-        set_parameter_by_name(_detail, "Text TOP Vis", 0)
-        set_parameter_by_name(_detail, "Text BTM Vis", 0)
-        set_parameter_by_name(_detail, "Extent Line",0)
-
-    set_parameter_by_name(_detail, "Text TOP", _texttop)
-    set_parameter_by_name(_detail, "Text BTM", _textbtm)
+for _shape in _shapes:
+    _shape.set_mm("text_location", _textloc)
+    _shape.set_mm("start_extent", _startnew)
+    _shape.set_mm("end_extent", _endnew)
+    _shape.set_flag("text_top_vis", False)
+    _shape.set_flag("text_btm_vis", False)
+    _shape.set_flag("extent_line_vis", False)
+    _shape.set_text("text_top", _texttop)
+    _shape.set_text("text_btm", _textbtm)
 
 # End Transaction
 t.Commit()
 
+if _skipped:
+    print("Skipped {} elements that are not reo shapes.".format(len(_skipped)))
+
 # from rpw.ui.forms import TextInput
 # from Autodesk.Revit import DB
 # from Autodesk.Revit.DB import Element, Transaction
@@ -1,16 +1,87 @@
 import clr
 clr.AddReference("RevitAPI")
 from Autodesk.Revit.DB import *
+from pyrevit import revit, forms
 
 doc = __revit__.ActiveUIDocument.Document
 
-# get all the importinstances in a revit file
-importInstances = FilteredElementCollector(doc).OfClass(ImportInstance).ToElements()
+# Line colour and projection line weight applied to every layer of an import
+STYLES = {
+    "Red": (Color(255, 0, 0), 1),
+    "Grey": (Color(128, 128, 128), 1),
+    "Black": (Color(0, 0, 0), 1),
+}
 
-# get name of category of importinstance
-for importInstance in importInstances:
-    print(importInstance.Category.Name)
 
-#change the importinstance colours in a view template
-for importInstance in importInstances:
-    importInstance.SetCategoryColor(Color(255, 0, 0))
+def get_import_categories():
+    """
+    Map each import category to its instances in a single collector pass.
+
+    Returns:
+        dict: Category id integer mapped to (category, list of ImportInstance).
+    """
+    categories = {}
+    for importInstance in FilteredElementCollector(doc).OfClass(ImportInstance):
+        category = importInstance.Category
+        if category is None:
+            continue
+        categories.setdefault(category.Id.IntegerValue, (category, []))[1].append(importInstance)
+    return categories
+
+
+def colors_match(a, b):
+    return a.IsValid and a.Red == b.Red and a.Green == b.Green and a.Blue == b.Blue
+
+
+def style_category(category, color, line_weight):
+    """
+    Set the line colour and weight of an import category and its layers, skipping those already set.
+
+    Must be called inside a transaction.
+
+    Returns:
+        int: The number of categories and layers changed.
+    """
+    changed = 0
+    for item in [category] + list(category.SubCategories):
+        item_changed = False
+        if not colors_match(item.LineColor, color):
+            item.LineColor = color
+            item_changed = True
+        if item.GetLineWeight(GraphicsStyleType.Projection) != line_weight:
+            item.SetLineWeight(line_weight, GraphicsStyleType.Projection)
+            item_changed = True
+        if item_changed:
+            changed += 1
+    return changed
+
+
+def main():
+    import_categories = get_import_categories()
+    if not import_categories:
+        forms.alert("No imported or linked CAD files found.", exitscript=True)
+
+    names = dict(
+        ("{} ({})".format(category.Name, len(instances)), category)
+        for category, instances in import_categories.values()
+    )
+    selected = forms.SelectFromList.show(
+        sorted(names.keys()), title="Select CAD imports to restyle", multiselect=True
+    )
+    if not selected:
+        return
+
+    style = forms.SelectFromList.show(sorted(STYLES.keys()), title="Select a line style")
+    if not style:
+        return
+    color, line_weight = STYLES[style]
+
+    # Categories are shared by every instance of an import, so each is styled once
+    with revit.Transaction("Style CAD Imports"):
+        for name in selected:
+            changed = style_category(names[name], color, line_weight)
+            print("{}: {}".format(name, "{} layers changed".format(changed) if changed else "unchanged"))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 from pyrevit import revit, DB
 from Autodesk.Revit.DB import Transaction
-import math
+import bisect
 
 doc = __revit__.ActiveUIDocument.Document
 
@@ -13,6 +13,9 @@ _selection = revit.get_selection()
 _levels = []
 _cols = []
 
+# Columns are not split within 100mm of their ends
+SPLIT_TOLERANCE = 100 / 304.8
+
 t = Transaction(doc, 'Split Cols')
 
 # Functions
@@ -20,10 +23,43 @@ def get_parameter_value_by_name(element, parameterName):
 	return element.LookupParameter(parameterName).AsValueString()
 
 def get_scol_vert(element):
-    extents = [round(element.GetSweptProfile().GetDrivingCurve().GetEndPoint(0).Z,3), round(element.GetSweptProfile().GetDrivingCurve().GetEndPoint(1).Z,3)]
+    curve = element.GetSweptProfile().GetDrivingCurve()
+    extents = [round(curve.GetEndPoint(0).Z, 3), round(curve.GetEndPoint(1).Z, 3)]
     extents.sort()
     return extents
 
+def get_split_elevations(col_btm, col_top, level_elevations):
+    """
+    Level elevations falling strictly inside the column, clear of the ends.
+
+    :param col_btm: Column bottom elevation (ft)
+    :param col_top: Column top elevation (ft)
+    :param level_elevations: Sorted list of level elevations (ft)
+    :return: Sorted list of split elevations
+    """
+    lo = bisect.bisect_right(level_elevations, col_btm + SPLIT_TOLERANCE)
+    hi = bisect.bisect_left(level_elevations, col_top - SPLIT_TOLERANCE)
+    return level_elevations[lo:hi]
+
+def get_split_parameters(col_btm, col_top, split_elevations):
+    """
+    Normalised split parameters to apply top-down to the same column.
+
+    Each split leaves the original element as the lower piece, so the
+    parameter of the next (lower) split is taken against the shortened column.
+
+    :param col_btm: Column bottom elevation (ft)
+    :param col_top: Column top elevation (ft)
+    :param split_elevations: Sorted list of split elevations (ft)
+    :return: List of split parameters, highest split first
+    """
+    params = []
+    top = col_top
+    for elevation in reversed(split_elevations):
+        params.append((elevation - col_btm) / (top - col_btm))
+        top = elevation
+    return params
+
 
 # Split selection into cols & levels
 for _elem in _selection:
@@ -37,21 +73,22 @@ if not _levels:
     coll_levels = DB.FilteredElementCollector(doc).OfCategory(DB.BuiltInCategory.OST_Levels).WhereElementIsNotElementType()
     for x in coll_levels:
         if get_parameter_value_by_name(x,"Structural") == "Yes":
-            _levels.append(x) 
-
-_levels.sort(key=lambda level: level.Elevation)
-_cols.sort(key=lambda col: get_scol_vert(col)[0])
-
-# Transaction 
-t.Start()
-
-for _level in _levels:
-    temp_levelev = _level.Elevation
-    for _col in _cols:
-        temp_colbtm = get_scol_vert(_col)[0]
-        temp_coltop = get_scol_vert(_col)[1]
-        if (temp_colbtm + 100/304.8)< temp_levelev < (temp_coltop - 100/304.8):
-            temp_levelev = round(temp_levelev,3)
-            temp_splitval = (temp_levelev - temp_colbtm)/(temp_coltop- temp_colbtm)
-            _cols.append(doc.GetElement(_col.Split(temp_splitval)))
-t.Commit()
\ No newline at end of file
+            _levels.append(x)
+
+_level_elevations = sorted(set(round(_level.Elevation, 3) for _level in _levels))
+
+# Snapshot column extents once and plan every split before touching the model
+_plan = []
+for _col in _cols:
+    temp_colbtm, temp_coltop = get_scol_vert(_col)
+    temp_splits = get_split_elevations(temp_colbtm, temp_coltop, _level_elevations)
+    if temp_splits:
+        _plan.append((_col, get_split_parameters(temp_colbtm, temp_coltop, temp_splits)))
+
+# Transaction
+if _plan:
+    t.Start()
+    for _col, temp_params in _plan:
+        for temp_splitval in temp_params:
+            _col.Split(temp_splitval)
+    t.Commit()
@@ -1,29 +1,181 @@
-from pyrevit import revit, DB
+import csv
+
+from pyrevit import revit, DB, forms, script
+from revitfunctions.polygons import tessellate_curves, get_bounding_box
+from revitfunctions.spatial import segment_overlap
 
 doc = __revit__.ActiveUIDocument.Document
 
-def get_parameter_value_by_name(element, parameterName):
-	return element.LookupParameter(parameterName).AsValueString()
+# Slab edges closer than this are treated as shared
+EDGE_TOLERANCE = 5 / 304.8  # 5mm
+# Slabs with top levels closer than this have no step
+SSL_TOLERANCE = 1  # mm
+
+COLUMNS = ["Upper", "Lower", "Upper SSL", "Lower SSL", "Overall Depth", "To Top Soffit", "To Top Lower"]
+
+
+def get_ssl_and_thickness(floor):
+	"""Get the top elevation and thickness of a floor in mm, from the raw parameter values."""
+	ssl = floor.get_Parameter(DB.BuiltInParameter.STRUCTURAL_ELEVATION_AT_TOP).AsDouble()
+	thk = floor.get_Parameter(DB.BuiltInParameter.FLOOR_ATTR_THICKNESS_PARAM).AsDouble()
+	return ssl * 304.8, thk * 304.8
+
+
+def get_project_base_elevation():
+	"""Get the elevation of the project base point in mm, the datum SSLs are reported from."""
+	return DB.BasePoint.GetProjectBasePoint(doc).Position.Z * 304.8
+
+
+def calc_step(slaba_ssl, slaba_thk, slabb_ssl, slabb_thk):
+	"""
+	Work out the step dimensions between two slabs.
+
+	Returns:
+		tuple: (overall depth, to top soffit, to top lower) in mm.
+	"""
+	if slaba_ssl > slabb_ssl:
+		overalldepth = slaba_ssl - slabb_ssl + slabb_thk
+		totopsoffit = overalldepth - slaba_thk
+		totoplower = slaba_ssl - slabb_ssl
+	else:
+		overalldepth = slabb_ssl - slaba_ssl + slaba_thk
+		totopsoffit = overalldepth - slabb_thk
+		totoplower = slabb_ssl - slaba_ssl
+	return overalldepth, totopsoffit, totoplower
+
+
+class SlabOutline(object):
+	"""
+	Snapshot of a floor's sketch edges and levels, read once.
+
+	Args:
+		floor (Autodesk.Revit.DB.Floor): The floor.
+	"""
+
+	def __init__(self, floor):
+		self.floor = floor
+		self.ssl, self.thk = get_ssl_and_thickness(floor)
+		self.segments = []
+		points = []
+		for curve_array in doc.GetElement(floor.SketchId).Profile:
+			loop = tessellate_curves(curve_array)
+			points.extend(loop)
+			for i in range(len(loop)):
+				self.segments.append((loop[i], loop[(i + 1) % len(loop)]))
+		self.bbox = get_bounding_box(points)
+
+	def name(self):
+		mark = self.floor.get_Parameter(DB.BuiltInParameter.ALL_MODEL_MARK).AsString()
+		return "{} [{}]".format(mark or self.floor.Name, self.floor.Id.IntegerValue)
+
+
+def edges_touch(outline_a, outline_b, tolerance=EDGE_TOLERANCE):
+	"""Check if any edge of one outline runs along part of an edge of the other."""
+	for start, end in outline_a.segments:
+		for other_start, other_end in outline_b.segments:
+			if segment_overlap(start, end, other_start, other_end, tolerance) > tolerance:
+				return True
+	return False
+
+
+def find_steps(outlines):
+	"""
+	Find every pair of slabs that share an edge and have different top levels.
+
+	Outlines are swept in X so only slabs with touching bounding boxes are compared.
+
+	Args:
+		outlines (list): SlabOutline for each floor.
+
+	Returns:
+		list: (upper outline, lower outline) pairs.
+	"""
+	steps = []
+	active = []
+	for outline in sorted(outlines, key=lambda x: x.bbox[0]):
+		min_x, min_y, max_x, max_y = outline.bbox
+		active = [x for x in active if x.bbox[2] >= min_x - EDGE_TOLERANCE]
+		for other in active:
+			if other.bbox[1] > max_y + EDGE_TOLERANCE or other.bbox[3] < min_y - EDGE_TOLERANCE:
+				continue
+			if abs(other.ssl - outline.ssl) < SSL_TOLERANCE:
+				continue
+			if edges_touch(outline, other):
+				upper, lower = (outline, other) if outline.ssl > other.ssl else (other, outline)
+				steps.append((upper, lower))
+		active.append(outline)
+	return steps
+
+
+def get_step_rows(steps, datum):
+	"""
+	Format the step table, with SSLs relative to the datum.
+
+	Args:
+		steps (list): (upper outline, lower outline) pairs from find_steps.
+		datum (float): The elevation the SSL columns are measured from, in mm.
+
+	Returns:
+		list: A row of strings for each step.
+	"""
+	rows = []
+	for upper, lower in steps:
+		overalldepth, totopsoffit, totoplower = calc_step(upper.ssl, upper.thk, lower.ssl, lower.thk)
+		rows.append([
+			upper.name(), lower.name(),
+			"{:.0f}".format(upper.ssl - datum), "{:.0f}".format(lower.ssl - datum),
+			"{:.0f}".format(overalldepth), "{:.0f}".format(totopsoffit), "{:.0f}".format(totoplower),
+		])
+	return rows
+
+
+def save_csv(rows):
+	csv_file_path = forms.save_file(file_ext="csv")
+	if not csv_file_path:
+		return
+	with open(csv_file_path, "wb") as csv_file:
+		writer = csv.writer(csv_file)
+		writer.writerow(COLUMNS)
+		writer.writerows(rows)
+	print("CSV file saved to: " + csv_file_path)
+
+
+def main():
+	selection = [x for x in revit.get_selection() if isinstance(x, DB.Floor)]
+
+	if len(selection) == 2:
+		slaba_ssl, slaba_thk = get_ssl_and_thickness(selection[0])
+		slabb_ssl, slabb_thk = get_ssl_and_thickness(selection[1])
+		overalldepth, totopsoffit, totoplower = calc_step(slaba_ssl, slaba_thk, slabb_ssl, slabb_thk)
+
+		print('{0}{1:>5.0f}'.format('Overall Depth:',overalldepth))
+		print('{0}{1:>5.0f}'.format('To Top Soffit:',totopsoffit))
+		print('{0}{1:>5.0f}'.format('To Top Lower:',totoplower))
+		return
+
+	# Otherwise check every step between the selected floors, or all floors in the view
+	floors = selection or list(
+		DB.FilteredElementCollector(doc, doc.ActiveView.Id)
+		.OfClass(DB.Floor)
+		.WhereElementIsNotElementType()
+	)
+	if len(floors) < 2:
+		forms.alert("Select two floors, or run in a view with floors.", exitscript=True)
+
+	outlines = [SlabOutline(floor) for floor in floors]
+	rows = get_step_rows(find_steps(outlines), get_project_base_elevation())
+	if not rows:
+		forms.alert("No steps found between {} floors.".format(len(floors)), exitscript=True)
 
-selection = revit.get_selection()
+	output = script.get_output()
+	output.print_table(table_data=rows, columns=COLUMNS, title="Slab Steps ({} floors)".format(len(floors)))
 
-slaba_ssl = float(get_parameter_value_by_name(selection[0],"Elevation at Top"))
-slaba_thk = float(get_parameter_value_by_name(selection[0],"Thickness"))
-slabb_ssl = float(get_parameter_value_by_name(selection[1],"Elevation at Top"))
-slabb_thk = float(get_parameter_value_by_name(selection[1],"Thickness"))
+	if forms.alert("Save the steps to CSV?", yes=True, no=True):
+		save_csv(rows)
 
-if slaba_ssl > slabb_ssl:
-	overalldepth = slaba_ssl - slabb_ssl + slabb_thk
-	totopsoffit = overalldepth - slaba_thk
-	totoplower = slaba_ssl - slabb_ssl
-else:
-	overalldepth = slabb_ssl - slaba_ssl + slaba_thk
-	totopsoffit = overalldepth - slabb_thk
-	totoplower = slabb_ssl - slaba_ssl
 
-print('{0}{1:>5.0f}'.format('Overall Depth:',overalldepth))
-print('{0}{1:>5.0f}'.format('To Top Soffit:',totopsoffit))
-print('{0}{1:>5.0f}'.format('To Top Lower:',totoplower))
+if __name__ == "__main__":
+	main()
 
 # import clr
 
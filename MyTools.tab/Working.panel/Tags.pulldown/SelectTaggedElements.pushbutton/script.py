@@ -13,46 +13,13 @@ Works with Revit 2022+ (handles API changes for subelements and 2024+).
 """
 
 from pyrevit import revit, DB, forms
+from revitfunctions.tags import tagged_ids_for
 
 __title__ = "Select Elements from Tags"
 __author__ = "Adam Shaw"
 
-def get_tagged_elements(tag, revit_ver):
-    """Get tagged elements based on Revit version."""
-    if revit_ver >= "2024.0":  # 2024, 2025, 2026+
-        # Use plural methods for subelements (most robust)
-        try:
-            return list(tag.GetTaggedLocalElements())
-        except AttributeError:
-            # Fallback to IDs method
-            element_ids = list(tag.GetTaggedLocalElementIds())
-            return [revit.doc.GetElement(eid) for eid in element_ids if eid != DB.ElementId.InvalidElementId]
-    elif revit_ver >= "2022.0":
-        # 2022-2023: GetTaggedLocalElements available
-        return list(tag.GetTaggedLocalElements())
-    else:
-        # Pre-2022: Legacy single element
-        tagged_element = tag.GetTaggedLocalElement()
-        return [tagged_element] if tagged_element else []
-
-def select_elements_from_tags(tags, revit_ver):
-    elements_to_select = []
-    seen_ids = set()
-    
-    for tag in tags:
-        if isinstance(tag, DB.IndependentTag):
-            tagged_elements = get_tagged_elements(tag, revit_ver)
-            for elem in tagged_elements:
-                if elem and elem.Id not in seen_ids:
-                    elements_to_select.append(elem)
-                    seen_ids.add(elem.Id)
-    
-    return elements_to_select
 
 def main():
-    doc = revit.doc
-    revit_ver = doc.Application.VersionNumber
-    
     selection = revit.get_selection()
     selected_tags = [elem for elem in selection if isinstance(elem, DB.IndependentTag)]
 
@@ -60,10 +27,10 @@ def main():
         forms.alert("No tags selected. Please select tags and run the script again.")
         return
 
-    elements = select_elements_from_tags(selected_tags, revit_ver)
+    element_ids = tagged_ids_for(selected_tags)
 
-    if elements:
-        revit.get_selection().set_to(elements)
+    if element_ids.Count:
+        revit.uidoc.Selection.SetElementIds(element_ids)
     else:
         forms.alert("No elements found for the selected tags.")
 
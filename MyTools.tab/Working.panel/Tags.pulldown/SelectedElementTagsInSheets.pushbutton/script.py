@@ -0,0 +1,35 @@
+"""
+This script selects all tags in views placed on sheets that are related to the selected elements in Revit.
+"""
+
+from pyrevit import revit, DB, forms
+from revitfunctions.tags import get_related_tag_ids, get_views_on_sheets
+
+__title__ = "Select Related Tags in Sheet Views"
+__author__ = "Adam Shaw"
+
+
+def main():
+    """
+    Main function to execute the script logic.
+    """
+    doc = revit.doc
+    uidoc = revit.uidoc
+
+    selected_ids = uidoc.Selection.GetElementIds()
+
+    if not selected_ids:
+        forms.alert("No elements selected. Please select elements and run the script again.")
+        return
+
+    sheet_view_ids = get_views_on_sheets(doc)
+    tag_ids = get_related_tag_ids(
+        doc,
+        selected_ids,
+        lambda owner_view_id, view_type: owner_view_id.IntegerValue in sheet_view_ids,
+    )
+    uidoc.Selection.SetElementIds(tag_ids)
+
+
+if __name__ == "__main__":
+    main()
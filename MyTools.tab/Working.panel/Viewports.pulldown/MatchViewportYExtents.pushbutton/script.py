@@ -30,11 +30,13 @@ def select_source_viewport():
         return None
 
 
-def get_viewports_with_same_template(source_view_template_id):
-    """Retrieve all viewports with the same view template as the source viewport."""
-    all_viewports = DB.FilteredElementCollector(revit.doc).OfClass(DB.Viewport).ToElements()
-    viewports_matching_templates = [revit.doc.GetElement(vp.ViewId) for vp in all_viewports if revit.doc.GetElement(vp.ViewId).ViewTemplateId == source_view_template_id]
-    return viewports_matching_templates
+def get_sheet_views_by_template():
+    """Map each view template id (int) to the views placed on sheets that use it, in one pass."""
+    views_by_template = {}
+    for vp in DB.FilteredElementCollector(revit.doc).OfClass(DB.Viewport):
+        view = revit.doc.GetElement(vp.ViewId)
+        views_by_template.setdefault(view.ViewTemplateId.IntegerValue, []).append(view)
+    return views_by_template
 
 
 def get_min_max_coordinates(crop_shape):
@@ -52,42 +54,86 @@ def get_min_max_coordinates(crop_shape):
     return min_z, max_z
 
 
-def set_view_crop_shape(target_view, min_z, max_z,btmoffset,topoffset):
-    threshold = 0.01
-    target_crsm = target_view.GetCropRegionShapeManager()
-    crop_shape = target_crsm.GetCropShape()
-    start_points = [line.GetEndPoint(0) for loop in crop_shape for line in loop]
+def get_crop_points(view):
+    """Snapshot the crop loop of a view as a list of (x, y, z) start points."""
+    crop_shape = view.GetCropRegionShapeManager().GetCropShape()
+    points = []
+    for loop in crop_shape:
+        for line in loop:
+            point = line.GetEndPoint(0)
+            points.append((point.X, point.Y, point.Z))
+    return points
+
+
+def get_new_crop_points(start_points, min_z, max_z, threshold=0.01):
+    """
+    Move the bottom and top points of a crop loop to new Z extents.
 
-    target_crsm.BottomAnnotationCropOffset = btmoffset
-    target_crsm.TopAnnotationCropOffset = topoffset
+    Args:
+        start_points (list): The crop loop points as (x, y, z) tuples.
+        min_z (float): The new bottom Z value.
+        max_z (float): The new top Z value.
+        threshold (float): Tolerance for points counted as bottom/top points.
 
-    # Find the minimum and maximum Z values in start_points
-    z_values = [point.Z for point in start_points]
+    Returns:
+        list: The new crop loop points as (x, y, z) tuples.
+    """
+    z_values = [point[2] for point in start_points]
     smallest_z = min(z_values)
     largest_z = max(z_values)
 
-    curve_loop = CurveLoop()
-    for i in range(len(start_points)):
-        start_point = start_points[i]
-        end_point = start_points[(i + 1) % len(start_points)]
-
-        start_point_new = start_point
-        end_point_new = end_point
+    new_points = []
+    for x, y, z in start_points:
+        if abs(z - smallest_z) < threshold:
+            z = min_z
+        elif abs(z - largest_z) < threshold:
+            z = max_z
+        new_points.append((x, y, z))
+    return new_points
 
-        if abs(start_point.Z - smallest_z) < threshold:
-            start_point_new = XYZ(start_point.X, start_point.Y, min_z)
-        elif abs(start_point.Z - largest_z) < threshold:
-            start_point_new = XYZ(start_point.X, start_point.Y, max_z)
 
-        if abs(end_point.Z - smallest_z) < threshold:
-            end_point_new = XYZ(end_point.X, end_point.Y, min_z)
-        elif abs(end_point.Z - largest_z) < threshold:
-            end_point_new = XYZ(end_point.X, end_point.Y, max_z)
+def points_match(points_a, points_b, threshold=0.01):
+    return len(points_a) == len(points_b) and all(
+        abs(a - b) < threshold
+        for point_a, point_b in zip(points_a, points_b)
+        for a, b in zip(point_a, point_b)
+    )
 
-        curve_loop.Append(Line.CreateBound(start_point_new, end_point_new))
 
+def create_crop_loop(points):
+    curve_loop = CurveLoop()
+    for i in range(len(points)):
+        start_point = XYZ(*points[i])
+        end_point = XYZ(*points[(i + 1) % len(points)])
+        curve_loop.Append(Line.CreateBound(start_point, end_point))
     return curve_loop
 
+
+def plan_crop_shapes(target_views, min_z, max_z, btmoffset, topoffset):
+    """
+    Work out the new crop loop of every target view before touching the model.
+
+    Views already at the source extents and annotation offsets are left out.
+
+    Returns:
+        list: (view, new crop points or None if unchanged, offsets changed) tuples.
+    """
+    plan = []
+    for target in target_views:
+        crop_points = get_crop_points(target)
+        new_points = get_new_crop_points(crop_points, min_z, max_z)
+        if points_match(crop_points, new_points):
+            new_points = None
+        target_crsm = target.GetCropRegionShapeManager()
+        offsets_changed = (
+            abs(target_crsm.BottomAnnotationCropOffset - btmoffset) > 1e-6
+            or abs(target_crsm.TopAnnotationCropOffset - topoffset) > 1e-6
+        )
+        if new_points is not None or offsets_changed:
+            plan.append((target, new_points, offsets_changed))
+    return plan
+
+
 def main():
     """Main function to control the flow of the script."""
     selected_viewports = get_selected_viewports()
@@ -101,7 +147,7 @@ def main():
         source_view = revit.doc.GetElement(source_viewport.ViewId)
         source_view_template = source_view.ViewTemplateId
         
-        matching_vptemplate_views = get_viewports_with_same_template(source_view_template)
+        matching_vptemplate_views = get_sheet_views_by_template().get(source_view_template.IntegerValue, [])
         sorted_views = sorted(matching_vptemplate_views,key=lambda x: x.Name)
         target_views = forms.SelectFromList.show(
             sorted_views,
@@ -129,11 +175,19 @@ def main():
     btmoffset = crsm.BottomAnnotationCropOffset
     topoffset = crsm.TopAnnotationCropOffset
     min_z, max_z = get_min_max_coordinates(crop_shape)
+    plan = plan_crop_shapes(target_views, min_z, max_z, btmoffset, topoffset)
+    if not plan:
+        forms.alert("All target views already match the source extents.")
+        return
+
     with revit.Transaction("Matching Views Extents"):
-        for target in target_views:
-            curve_loop = set_view_crop_shape(target,min_z,max_z,btmoffset,topoffset)
-            crsm = target.GetCropRegionShapeManager()
-            crsm.SetCropShape(curve_loop)
+        for target, new_points, offsets_changed in plan:
+            target_crsm = target.GetCropRegionShapeManager()
+            if offsets_changed:
+                target_crsm.BottomAnnotationCropOffset = btmoffset
+                target_crsm.TopAnnotationCropOffset = topoffset
+            if new_points is not None:
+                target_crsm.SetCropShape(create_crop_loop(new_points))
 
 
 if __name__ == "__main__":
@@ -18,6 +18,8 @@ from Autodesk.Revit.DB import DatumExtentType, FilteredElementCollector
 __title__ = "Propagate 2D grids extents from viewport to views"
 __author__ = "Adam Shaw"
 
+CURVE_TOLERANCE = 1 / 304.8  # 1mm
+
 
 def get_viewport_view(viewport):
     """
@@ -50,57 +52,101 @@ def get_grid_curves(view):
     return grid_curves_dict
 
 
+def curves_match(curves_a, curves_b, tolerance=CURVE_TOLERANCE):
+    """
+    Check if two lists of grid curves have the same endpoints in plan.
+
+    Args:
+        curves_a (list): The first list of DB.Curve objects.
+        curves_b (list): The second list of DB.Curve objects.
+        tolerance (float): The allowed XY difference between endpoints, in feet.
+
+    Returns:
+        bool: True if every curve endpoint matches within tolerance.
+    """
+    if len(curves_a) != len(curves_b):
+        return False
+    for curve_a, curve_b in zip(curves_a, curves_b):
+        for i in (0, 1):
+            point_a = curve_a.GetEndPoint(i)
+            point_b = curve_b.GetEndPoint(i)
+            if abs(point_a.X - point_b.X) > tolerance or abs(point_a.Y - point_b.Y) > tolerance:
+                return False
+    return True
+
+
 def copy_curves_to_views(grid_curves_dict, views):
     """
-    Copy the curves to the specified views.
+    Copy the curves to the specified views, skipping grids that already match.
     
     Args:
         grid_curves_dict (dict): A dictionary with grid elements as keys and their corresponding curves as values.
         views (list): List of DB.View objects to copy curves to.
+
+    Returns:
+        tuple: (number of grids updated, number of grids already matching).
     """
+    updated = 0
+    skipped = 0
     with revit.Transaction("Copy Grid Curves"):
         for view in views:
             for grid, curves in grid_curves_dict.items():
+                try:
+                    existing_curves = list(grid.GetCurvesInView(DatumExtentType.ViewSpecific, view))
+                except Exception:
+                    existing_curves = []
+                if curves_match(existing_curves, curves):
+                    skipped += 1
+                    continue
                 for curve in curves:
                     grid.SetCurveInView(DatumExtentType.ViewSpecific, view, curve)
+                updated += 1
+    return updated, skipped
 
 
-def get_scope_box_value(view):
+def get_scope_box_id(view):
     """
-    Get the value of the "Scope Box" parameter of the view.
+    Get the id of the scope box assigned to the view.
     
     Args:
-        view (DB.View): The view to retrieve the "Scope Box" parameter value from.
+        view (DB.View): The view to retrieve the scope box from.
         
     Returns:
-        str: The value of the "Scope Box" parameter.
+        int: The scope box id, or -1 if the view has no scope box.
     """
     scope_box_param = view.Parameter[DB.BuiltInParameter.VIEWER_VOLUME_OF_INTEREST_CROP]
-    return scope_box_param.AsValueString() if scope_box_param else None
+    return scope_box_param.AsElementId().IntegerValue if scope_box_param else -1
+
 
+def get_view_key(view):
+    return (view.ViewType, view.Scale, get_scope_box_id(view))
 
-def filter_views_by_scale_and_scope_box(source_view, all_views):
+
+def build_view_index(all_views, view_type):
     """
-    Filter the list of views based on the scale and scope box parameter value of the source view.
+    Group the views of one view type by scale and scope box in a single pass.
+
+    The view type is checked first, so scale and scope box are only read for
+    views that can match.
     
     Args:
-        source_view (DB.View): The source view to match the scale and scope box parameter value.
         all_views (list): List of all views in the model.
+        view_type (DB.ViewType): The view type to index.
         
     Returns:
-        list: Filtered list of views matching the scale and scope box parameter value of the source view.
+        dict: (ViewType, Scale, scope box id) mapped to a list of views.
     """
-    filtered_views = []
-    source_view_scale = source_view.Scale
-    source_scope_box_value = get_scope_box_value(source_view)
-    
+    view_index = {}
     for view in all_views:
-        if view.ViewType == source_view.ViewType and view.Scale == source_view_scale:
-            view_scope_box_value = get_scope_box_value(view)
-            if source_scope_box_value == view_scope_box_value:
-                filtered_views.append(view)
-    
-    return filtered_views
+        if view.ViewType != view_type or view.IsTemplate:
+            continue
+        view_index.setdefault(get_view_key(view), []).append(view)
+    return view_index
+
+
+def get_view_elevation(view):
+    level = view.GenLevel
+    return level.Elevation if level else 0.0
 
 
 def main():
@@ -128,9 +174,18 @@ def main():
         return
         
     all_views = FilteredElementCollector(revit.doc).OfClass(DB.View).ToElements()
-    filtered_views = filter_views_by_scale_and_scope_box(source_view, all_views)
+    view_index = build_view_index(all_views, source_view.ViewType)
+    filtered_views = [
+        view for view in view_index.get(get_view_key(source_view), [])
+        if view.Id != source_view.Id
+    ]
     
-    sorted_views = sorted(filtered_views, key=lambda view: view.GenLevel.Elevation)
+    sorted_views = [
+        view for _, view in sorted(
+            ((get_view_elevation(view), view) for view in filtered_views),
+            key=lambda x: x[0],
+        )
+    ]
     
     target_views = forms.SelectFromList.show(sorted_views, 
                                              multiselect=True, 
@@ -141,7 +196,8 @@ def main():
         forms.alert("No target views selected. Please select at least one view.")
         return
         
-    copy_curves_to_views(grid_curves_dict, target_views)
+    updated, skipped = copy_curves_to_views(grid_curves_dict, target_views)
+    print("Updated {} grid extents, {} already matched.".format(updated, skipped))
 
 
 if __name__ == "__main__":
@@ -2,25 +2,23 @@
 Reset the label position of selected viewports.
 
 Usage:
-1. Select one or more viewports in the Revit project.
-2. Run this script to reset the label position of the selected viewports.
+1. Select one or more viewports in the Revit project, or select nothing to pick sheets.
+2. Run this script to reset the label position of the selected viewports (or every viewport on the picked sheets).
 """
 
-from pyrevit import revit, DB
+from pyrevit import revit, DB, forms, script
+from revitfunctions.viewbatch import (
+    make_view_predicate,
+    resolve_viewports,
+    set_viewport_label_offset,
+)
 
 __title__ = "Reset Viewport Label Position"
 __author__ = "Adam Shaw"
 
+LABEL_OFFSET = (1/304.8, 0, 0)
 
-def reset_viewport_label_position(viewport):
-    """
-    Reset the label position of the given viewport.
-    
-    Args:
-        viewport (DB.Viewport): The viewport element to reset the label position for.
-    """
-    label_offset = DB.XYZ(1/304.8, 0, 0)
-    viewport.LabelOffset = label_offset
+logger = script.get_logger()
 
 
 def main():
@@ -28,20 +26,27 @@ def main():
     Main function to execute the script logic.
     """
     selection = revit.get_selection()
-    
-    if not selection:
+
+    if selection:
+        selected_viewports = []
+        for elem in selection:
+            if isinstance(elem, DB.Viewport):
+                selected_viewports.append(elem)
+            else:
+                logger.warning("Skipping non-viewport element: {}".format(elem.Id))
+    else:
+        sheets = forms.select_sheets(title="Select Sheets", button_name="Reset Labels")
+        if not sheets:
+            return
+        selected_viewports = resolve_viewports(revit.doc, make_view_predicate(sheets=sheets))
+
+    if not selected_viewports:
         forms.alert("No viewports selected. Please select viewports and run the script again.")
         return
-    
-    selected_viewports = [revit.doc.GetElement(elem_id) for elem_id in selection.element_ids]
-    
-    with revit.Transaction("Reset Viewport Label Position"):
-        for viewport in selected_viewports:
-            if isinstance(viewport, DB.Viewport):
-                reset_viewport_label_position(viewport)
-            else:
-                logger.warning("Skipping non-viewport element: {}".format(viewport.Id))
+
+    result = set_viewport_label_offset(selected_viewports, LABEL_OFFSET)
+    print(result.report())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,9 +1,20 @@
 # Importing necessary libraries
 from pyrevit import script, forms, revit, DB
 from Autodesk.Revit.DB import ViewType
+from revitfunctions.viewbatch import (
+    make_view_predicate,
+    resolve_views,
+    set_annotation_crop_offset,
+)
+
+SELECT_VIEWS = 'Select Views'
+SELECT_SHEETS = 'All Plans on Sheets'
 
 # Get the offset value from the user
-offset_value = float(forms.ask_for_string('Enter off in mm'))/304.8
+offset_input = forms.ask_for_string('Enter off in mm')
+if not offset_input:
+    script.exit()
+offset_value = float(offset_input)/304.8
 
 # Get the current document
 doc = revit.doc
@@ -13,27 +24,32 @@ def filter_by_view_type(view):
     # Check if the view type is StructuralPlan
     return view.ViewType == ViewType.EngineeringPlan
 
-# Filter views to only show StructuralPlan views
-filtered_views = forms.select_views(
-    title='Select Views',
-    button_name='Select',
-    width=500,
-    multiple=True,
-    filterfunc=filter_by_view_type,  # Use the custom filter function
-    doc=None
-)
+mode = forms.alert('Which views should be updated?', options=[SELECT_VIEWS, SELECT_SHEETS])
+
+if mode == SELECT_VIEWS:
+    # Filter views to only show StructuralPlan views
+    filtered_views = forms.select_views(
+        title='Select Views',
+        button_name='Select',
+        width=500,
+        multiple=True,
+        filterfunc=filter_by_view_type,  # Use the custom filter function
+        doc=None
+    )
+elif mode == SELECT_SHEETS:
+    # Every StructuralPlan view placed on the chosen sheets
+    sheets = forms.select_sheets(title='Select Sheets', button_name='Select')
+    filtered_views = None
+    if sheets:
+        filtered_views = resolve_views(
+            doc, make_view_predicate(view_types=[ViewType.EngineeringPlan], sheets=sheets)
+        )
+else:
+    script.exit()
+
+if not filtered_views:
+    script.exit()
 
-# Start a transaction in the Revit document
-with DB.Transaction(doc, 'Set Annotation Crop Offset') as t:
-    t.Start()
-    
-    # Iterate over all viewports
-    for _views in filtered_views:
-        regionMan = _views.GetCropRegionShapeManager()
-        regionMan.BottomAnnotationCropOffset = offset_value
-        regionMan.LeftAnnotationCropOffset = offset_value
-        regionMan.RightAnnotationCropOffset = offset_value
-        regionMan.TopAnnotationCropOffset = offset_value
-        
-    # Commit the transaction
-    t.Commit()
\ No newline at end of file
+# Apply the offset in a single transaction, skipping views already set
+result = set_annotation_crop_offset(filtered_views, offset_value)
+print(result.report())
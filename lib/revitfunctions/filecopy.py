@@ -0,0 +1,170 @@
+import hashlib
+import os
+import re
+import shutil
+import time
+
+try:
+    from System.IO import File as NetFile
+except ImportError:
+    NetFile = None
+
+
+CHUNK_SIZE = 16 * 1024 * 1024  # 16MB
+# Modified times closer than this are treated as equal (FAT/SMB round to 2s)
+MTIME_TOLERANCE = 2.0
+
+
+def file_digest(path, chunk_size=CHUNK_SIZE):
+    """
+    Hash a file in chunks.
+
+    Args:
+        path (str): The file to hash.
+        chunk_size (int): Bytes read at a time.
+
+    Returns:
+        str: The SHA-1 hex digest of the file.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_copy_current(src, dst, check_hash=False):
+    """
+    Check if a destination file is already a copy of the source.
+
+    Args:
+        src (str): The source file.
+        dst (str): The destination file.
+        check_hash (bool): Also compare file contents when size and mtime match.
+
+    Returns:
+        bool: True if the destination does not need copying.
+    """
+    if not os.path.exists(dst):
+        return False
+    src_stat = os.stat(src)
+    dst_stat = os.stat(dst)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if abs(src_stat.st_mtime - dst_stat.st_mtime) > MTIME_TOLERANCE:
+        return False
+    return not check_hash or file_digest(src) == file_digest(dst)
+
+
+def replace_file(src, dst):
+    """Move src over dst, replacing dst in a single step where the platform allows."""
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    elif NetFile is not None and os.path.exists(dst):
+        NetFile.Replace(src, dst, None)
+    else:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def copy_file(src, dst, progress=None, chunk_size=CHUNK_SIZE, check_hash=False, force=False):
+    """
+    Copy a file in large chunks through a temporary file, skipping current copies.
+
+    The copy is written next to the destination and renamed over it once
+    complete, so a failed copy never leaves a partial destination file.
+
+    Args:
+        src (str): The source file.
+        dst (str): The destination file.
+        progress (callable, optional): Called with (bytes copied, total bytes).
+        chunk_size (int): Bytes copied at a time.
+        check_hash (bool): Also compare file contents when size and mtime match.
+        force (bool): Copy without checking the destination first.
+
+    Returns:
+        bool: True if the file was copied, False if the destination was current.
+    """
+    if not force and is_copy_current(src, dst, check_hash):
+        return False
+
+    total = os.path.getsize(src)
+    copied = 0
+    tmp_path = dst + ".part"
+    try:
+        with open(src, "rb") as f_src:
+            with open(tmp_path, "wb") as f_dst:
+                while True:
+                    chunk = f_src.read(chunk_size)
+                    if not chunk:
+                        break
+                    f_dst.write(chunk)
+                    copied += len(chunk)
+                    if progress:
+                        progress(copied, total)
+        shutil.copystat(src, tmp_path)
+        replace_file(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def link_or_copy(src, dst):
+    """Hard link dst to src, falling back to a copy where hard links are unavailable."""
+    if hasattr(os, "link"):
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def snapshot_file(src, dst, keep=0, progress=None, check_hash=False):
+    """
+    Copy a file, keeping the previous copies as rotating snapshots.
+
+    Before the destination is replaced it is hard linked to a timestamped
+    snapshot, so snapshots share disk space with the copy they were taken from.
+    Nothing is copied or snapshotted while the destination is current.
+
+    Args:
+        src (str): The source file.
+        dst (str): The destination file, e.g. C:\\temp\\copy_model.rvt.
+        keep (int): Number of snapshots to keep; 0 disables snapshots.
+        progress (callable, optional): Called with (bytes copied, total bytes).
+        check_hash (bool): Also compare file contents when size and mtime match.
+
+    Returns:
+        bool: True if the file was copied, False if the destination was current.
+    """
+    if is_copy_current(src, dst, check_hash):
+        return False
+
+    root, ext = os.path.splitext(dst)
+    if keep > 0 and os.path.exists(dst):
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(os.path.getmtime(dst)))
+        snapshot = "{}_{}{}".format(root, stamp, ext)
+        if not os.path.exists(snapshot):
+            link_or_copy(dst, snapshot)
+
+    copy_file(src, dst, progress, force=True)
+
+    if keep > 0:
+        prune_snapshots(dst, keep)
+    return True
+
+
+def prune_snapshots(dst, keep):
+    """Delete the oldest snapshots of a file, keeping the newest `keep`."""
+    folder, filename = os.path.split(dst)
+    root, ext = os.path.splitext(filename)
+    pattern = re.compile(re.escape(root) + r"_\d{8}_\d{6}" + re.escape(ext) + "$")
+    snapshots = sorted(name for name in os.listdir(folder or ".") if pattern.match(name))
+    for name in snapshots[:-keep]:
+        os.remove(os.path.join(folder, name))
@@ -0,0 +1,54 @@
+from Autodesk.Revit.DB import (
+    BuiltInCategory,
+    FilledRegion,
+    GraphicsStyleType,
+)
+
+
+def build_line_style_catalogue(doc):
+    """
+    Map the names of all line styles usable on filled regions to their ids.
+
+    Reads the subcategories of the Lines category, which include
+    <Invisible lines>, rather than collecting every GraphicsStyle.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+
+    Returns:
+        dict: Line style name mapped to the GraphicsStyle id.
+    """
+    lines_category = doc.Settings.Categories.get_Item(BuiltInCategory.OST_Lines)
+    catalogue = {}
+    for subcategory in lines_category.SubCategories:
+        style = subcategory.GetGraphicsStyle(GraphicsStyleType.Projection)
+        if style and FilledRegion.IsValidLineStyleIdForFilledRegion(doc, style.Id):
+            catalogue[style.Name] = style.Id
+    return catalogue
+
+
+def set_filled_region_line_style(filled_regions, line_style_id):
+    """
+    Set the line style of filled regions, skipping those already using it.
+
+    Must be called inside a transaction.
+
+    Args:
+        filled_regions (iterable): Elements to update; anything that is not a
+            FilledRegion is ignored.
+        line_style_id (Autodesk.Revit.DB.ElementId): The GraphicsStyle id.
+
+    Returns:
+        tuple: (number of regions updated, number already using the style).
+    """
+    updated = 0
+    skipped = 0
+    for filled_region in filled_regions:
+        if not isinstance(filled_region, FilledRegion):
+            continue
+        if filled_region.GetLineStyleId() == line_style_id:
+            skipped += 1
+            continue
+        filled_region.SetLineStyleId(line_style_id)
+        updated += 1
+    return updated, skipped
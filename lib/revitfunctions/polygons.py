@@ -0,0 +1,281 @@
+import heapq
+import math
+
+from revitfunctions.spatial import point_segment_distance
+
+
+def tessellate_curves(curves):
+    """
+    Tessellate a closed chain of curves into a list of 2D vertices.
+
+    Args:
+        curves (iterable): Connected Autodesk.Revit.DB.Curve objects forming a loop,
+            e.g. a CurveArray from a sketch profile.
+
+    Returns:
+        list: The loop vertices as (x, y) tuples, without repeating the first vertex.
+    """
+    points = []
+    for curve in curves:
+        tessellated = list(curve.Tessellate())
+        # Each curve starts where the previous one finished
+        for point in tessellated[:-1]:
+            points.append((point.X, point.Y))
+    return points
+
+
+def signed_area(points):
+    """
+    Get the signed area of a polygon with the shoelace formula.
+
+    Args:
+        points (list): The polygon vertices as (x, y) tuples.
+
+    Returns:
+        float: The area, positive for anticlockwise and negative for clockwise loops.
+    """
+    area = 0.0
+    count = len(points)
+    for i in range(count):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % count]
+        area += x0 * y1 - x1 * y0
+    return area / 2.0
+
+
+def get_centroid(points):
+    """
+    Get the area centroid of a polygon.
+
+    Args:
+        points (list): The polygon vertices as (x, y) tuples.
+
+    Returns:
+        tuple: The centroid as (x, y), or the vertex average for a zero area loop.
+    """
+    area = signed_area(points)
+    count = len(points)
+    if area == 0:
+        return (sum(x for x, _ in points) / count, sum(y for _, y in points) / count)
+    cx = 0.0
+    cy = 0.0
+    for i in range(count):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % count]
+        cross = x0 * y1 - x1 * y0
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+    return (cx / (6.0 * area), cy / (6.0 * area))
+
+
+def get_bounding_box(points):
+    """
+    Get the 2D bounding box of a list of points.
+
+    Args:
+        points (list): The points as (x, y) tuples.
+
+    Returns:
+        tuple: (min_x, min_y, max_x, max_y).
+    """
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def point_in_polygon(x, y, points):
+    """
+    Check if a point is inside a polygon using the even-odd rule.
+
+    Args:
+        x, y (float): The point.
+        points (list): The polygon vertices as (x, y) tuples.
+
+    Returns:
+        bool: True if the point is inside the polygon.
+    """
+    inside = False
+    count = len(points)
+    j = count - 1
+    for i in range(count):
+        xi, yi = points[i]
+        xj, yj = points[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+class Polygon(object):
+    """
+    A closed 2D loop with its area and bounding box precomputed.
+
+    Args:
+        points (list): The polygon vertices as (x, y) tuples.
+        source: Optional object the loop came from (e.g. a CurveArray).
+    """
+
+    def __init__(self, points, source=None):
+        self.points = points
+        self.source = source
+        self.signed_area = signed_area(points)
+        self.area = abs(self.signed_area)
+        self.bbox = get_bounding_box(points)
+        self.parent = None
+        self.children = []
+        self.depth = 0
+
+    def bbox_contains(self, other):
+        return (
+            self.bbox[0] <= other.bbox[0]
+            and self.bbox[1] <= other.bbox[1]
+            and self.bbox[2] >= other.bbox[2]
+            and self.bbox[3] >= other.bbox[3]
+        )
+
+    def contains(self, other):
+        """
+        Check if another, non-intersecting polygon lies inside this one.
+
+        Args:
+            other (Polygon): The polygon to test.
+
+        Returns:
+            bool: True if the other polygon is inside this one.
+        """
+        if other.area >= self.area or not self.bbox_contains(other):
+            return False
+        x, y = other.points[0]
+        return point_in_polygon(x, y, self.points)
+
+
+def build_containment_tree(polygons):
+    """
+    Nest non-intersecting polygons by containment.
+
+    Polygons are placed largest first, so every polygon's container has already
+    been placed and only the children along one branch need testing.
+
+    Args:
+        polygons (list): Polygon objects. Their parent, children and depth are set.
+
+    Returns:
+        list: The root (outermost) polygons.
+    """
+    roots = []
+    for polygon in sorted(polygons, key=lambda x: x.area, reverse=True):
+        polygon.parent = None
+        polygon.children = []
+        polygon.depth = 0
+
+        siblings = roots
+        parent = None
+        while True:
+            container = next((x for x in siblings if x.contains(polygon)), None)
+            if container is None:
+                break
+            parent = container
+            siblings = container.children
+
+        if parent is not None:
+            polygon.parent = parent
+            polygon.depth = parent.depth + 1
+        siblings.append(polygon)
+    return roots
+
+
+def group_by_containment(polygons):
+    """
+    Group polygons into outer boundaries and their holes.
+
+    Polygons at an even depth in the containment tree are outer boundaries,
+    their direct children are holes. Islands inside holes start new groups.
+
+    Args:
+        polygons (list): Polygon objects.
+
+    Returns:
+        list: Groups as lists of polygons, the outer boundary first.
+    """
+    groups = []
+    stack = list(build_containment_tree(polygons))
+    while stack:
+        outer = stack.pop()
+        groups.append([outer] + outer.children)
+        for hole in outer.children:
+            stack.extend(hole.children)
+    groups.sort(key=lambda x: x[0].area, reverse=True)
+    return groups
+
+
+def _boundary_distance(x, y, group):
+    """Distance from a point to the nearest edge of a group, negative outside it."""
+    distance = None
+    for polygon in group:
+        points = polygon.points
+        count = len(points)
+        for i in range(count):
+            ax, ay = points[i]
+            bx, by = points[(i + 1) % count]
+            edge_distance = point_segment_distance(x, y, ax, ay, bx, by)
+            if distance is None or edge_distance < distance:
+                distance = edge_distance
+    outer = group[0]
+    inside = point_in_polygon(x, y, outer.points) and not any(
+        point_in_polygon(x, y, hole.points) for hole in group[1:]
+    )
+    return distance if inside else -distance
+
+
+def get_inscribed_point(group, precision=None):
+    """
+    Find the point of a polygon with holes furthest from its edges.
+
+    Unlike the centroid, the point is always inside the polygon, so it suits
+    tag and label placement on L shaped or holed outlines. Cells covering the
+    bounding box are split until none could hold a point more than `precision`
+    further from the edges than the best found.
+
+    Args:
+        group (list): Polygons with the outer boundary first, then its holes,
+            as returned by group_by_containment.
+        precision (float, optional): Defaults to 1% of the larger bounding box side.
+
+    Returns:
+        tuple: ((x, y), distance to the nearest edge).
+    """
+    min_x, min_y, max_x, max_y = group[0].bbox
+    size = min(max_x - min_x, max_y - min_y)
+    if precision is None:
+        precision = max(max_x - min_x, max_y - min_y) / 100.0
+    if size <= 0:
+        return ((min_x + max_x) / 2, (min_y + max_y) / 2), 0.0
+
+    def make_cell(x, y, half):
+        distance = _boundary_distance(x, y, group)
+        # Heap ordered by the best distance a point in the cell could have
+        return (-(distance + half * math.sqrt(2)), distance, x, y, half)
+
+    cells = []
+    half = size / 2.0
+    x = min_x
+    while x < max_x:
+        y = min_y
+        while y < max_y:
+            heapq.heappush(cells, make_cell(x + half, y + half, half))
+            y += size
+        x += size
+
+    cx, cy = get_centroid(group[0].points)
+    best = make_cell(cx, cy, 0)
+    while cells:
+        cell = heapq.heappop(cells)
+        if cell[1] > best[1]:
+            best = cell
+        if -cell[0] - best[1] <= precision:
+            continue
+        half = cell[4] / 2.0
+        for dx in (-half, half):
+            for dy in (-half, half):
+                heapq.heappush(cells, make_cell(cell[2] + dx, cell[3] + dy, half))
+    return (best[2], best[3]), best[1]
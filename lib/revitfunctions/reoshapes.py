@@ -0,0 +1,149 @@
+from Autodesk.Revit.DB import ElementId
+
+
+# Logical reo shape fields mapped to the parameter names used by each family
+# generation, newest first: (Revit 2021 name, Revit 2019 name)
+REO_SHAPE_FIELDS = {
+    "start_extent": ("LEFT Extent", "Start Rebar Area Extents"),
+    "end_extent": ("RIGHT Extent", "End Rebar Area Extents"),
+    "text_location": ("Text Location",),
+    "start_extension": ("BTM Length", "Start Rebar Extension"),
+    "end_extension": ("TOP Length", "End Rebar Extension"),
+    "text_top_vis": ("Text TOP Vis", "Text TOP On/Off"),
+    "text_top": ("Text TOP",),
+    "text_btm_vis": ("Text BTM Vis", "Text BTM On/Off"),
+    "text_btm": ("Text BTM",),
+    "extent_line_vis": ("Extent Line", "Extent Line On/Off"),
+}
+
+
+class ReoShapeSchema(object):
+    """
+    The parameter Definitions backing each logical field of a reo shape family type.
+
+    Args:
+        definitions (dict): Logical field name mapped to the parameter Definition,
+            for the fields the family type has.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+
+    def has_fields(self, fields):
+        return all(field in self.definitions for field in fields)
+
+    def bind(self, element):
+        """Get the parameters of an element for every resolved field."""
+        return ReoShapeParameters(
+            dict(
+                (field, element.get_Parameter(definition))
+                for field, definition in self.definitions.items()
+            )
+        )
+
+
+class ReoShapeParameters(object):
+    """
+    Resolved parameters of a single reo shape, read and written by logical field.
+
+    Lengths are read and written in mm.
+    """
+
+    def __init__(self, parameters):
+        self.parameters = parameters
+
+    def get_mm(self, field):
+        return int(round(self.parameters[field].AsDouble() * 304.8))
+
+    def get_flag(self, field):
+        return self.parameters[field].AsInteger() == 1
+
+    def get_text(self, field):
+        return self.parameters[field].AsString() or ""
+
+    def set_mm(self, field, value):
+        self.parameters[field].Set(value / 304.8)
+
+    def set_flag(self, field, value):
+        self.parameters[field].Set(1 if value else 0)
+
+    def set_text(self, field, value):
+        self.parameters[field].Set(value)
+
+
+# Number of family generations named in REO_SHAPE_FIELDS
+GENERATION_COUNT = 2
+
+
+def resolve_generation(element, generation):
+    """
+    Look up the parameters of one family generation on an element.
+
+    Fields with a single name are shared by every generation.
+
+    Args:
+        element (Autodesk.Revit.DB.FamilyInstance): A reo shape detail component.
+        generation (int): Index into the names of REO_SHAPE_FIELDS, 0 being the newest.
+
+    Returns:
+        ReoShapeSchema: The fields of that generation the element has.
+    """
+    definitions = {}
+    for field, names in REO_SHAPE_FIELDS.items():
+        parameter = element.LookupParameter(names[min(generation, len(names) - 1)])
+        if parameter is not None:
+            definitions[field] = parameter.Definition
+    return ReoShapeSchema(definitions)
+
+
+def resolve_schema(element, fields):
+    """
+    Pick the newest family generation that has every required field.
+
+    Parameters are never mixed across generations, so a family carrying
+    leftover parameters of an older generation still resolves consistently.
+
+    Args:
+        element (Autodesk.Revit.DB.FamilyInstance): A reo shape detail component.
+        fields (iterable): Logical fields the family type must have.
+
+    Returns:
+        ReoShapeSchema: The first complete generation, or the newest one if
+            none has every field.
+    """
+    schemas = [resolve_generation(element, x) for x in range(GENERATION_COUNT)]
+    for schema in schemas:
+        if schema.has_fields(fields):
+            return schema
+    return schemas[0]
+
+
+def get_reo_shapes(elements, fields):
+    """
+    Bind the reo shape parameters of many elements, resolving each family type once.
+
+    Args:
+        elements (iterable): The selected elements.
+        fields (iterable): Logical fields the family type must have.
+
+    Returns:
+        tuple: (list of ReoShapeParameters, list of elements skipped for missing fields).
+    """
+    fields = list(fields)
+    schemas = {}
+    shapes = []
+    skipped = []
+    for element in elements:
+        type_id = element.GetTypeId()
+        if type_id == ElementId.InvalidElementId:
+            schema = resolve_schema(element, fields)
+        else:
+            key = type_id.IntegerValue
+            if key not in schemas:
+                schemas[key] = resolve_schema(element, fields)
+            schema = schemas[key]
+        if schema.has_fields(fields):
+            shapes.append(schema.bind(element))
+        else:
+            skipped.append(element)
+    return shapes, skipped
@@ -0,0 +1,212 @@
+import math
+
+
+def point_segment_distance(px, py, ax, ay, bx, by):
+    """
+    Get the shortest 2D distance from a point to a line segment.
+
+    Args:
+        px, py (float): The point.
+        ax, ay (float): The segment start point.
+        bx, by (float): The segment end point.
+
+    Returns:
+        float: The distance from the point to the closest point on the segment.
+    """
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - ax, py - ay)
+    t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+    t = max(0.0, min(1.0, t))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def is_parallel(dir_a, dir_b, angle_tolerance):
+    """
+    Check if two 2D directions are parallel (or anti-parallel) within a tolerance.
+
+    Args:
+        dir_a (tuple): First direction as (x, y), not necessarily normalised.
+        dir_b (tuple): Second direction as (x, y), not necessarily normalised.
+        angle_tolerance (float): The allowed angle between directions in radians.
+
+    Returns:
+        bool: True if the directions are parallel.
+    """
+    len_a = math.hypot(dir_a[0], dir_a[1])
+    len_b = math.hypot(dir_b[0], dir_b[1])
+    if len_a == 0 or len_b == 0:
+        return False
+    cross = (dir_a[0] * dir_b[1] - dir_a[1] * dir_b[0]) / (len_a * len_b)
+    return abs(cross) <= math.sin(angle_tolerance)
+
+
+def segment_overlap(a_start, a_end, b_start, b_end, tolerance):
+    """
+    Get the length over which two 2D segments run along each other.
+
+    The segments overlap if both ends of the second lie within the tolerance
+    of the line through the first, i.e. they are collinear, and their
+    projections onto that line share some length.
+
+    Args:
+        a_start, a_end (tuple): The first segment as (x, y) points.
+        b_start, b_end (tuple): The second segment as (x, y) points.
+        tolerance (float): The allowed offset between the segments.
+
+    Returns:
+        float: The shared length, 0 if the segments do not overlap.
+    """
+    dx = a_end[0] - a_start[0]
+    dy = a_end[1] - a_start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return 0.0
+    ux = dx / length
+    uy = dy / length
+    for point in (b_start, b_end):
+        offset = (point[0] - a_start[0]) * uy - (point[1] - a_start[1]) * ux
+        if abs(offset) > tolerance:
+            return 0.0
+    t0 = (b_start[0] - a_start[0]) * ux + (b_start[1] - a_start[1]) * uy
+    t1 = (b_end[0] - a_start[0]) * ux + (b_end[1] - a_start[1]) * uy
+    overlap = min(length, max(t0, t1)) - max(0.0, min(t0, t1))
+    return max(0.0, overlap)
+
+
+class SegmentIndex(object):
+    """
+    Uniform grid hash of 2D line segments for nearest-segment lookups.
+
+    Each segment is stored in every grid cell its bounding box touches, so a
+    query only measures the segments in the cells around the search point.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.segments = {}
+        self.cells = {}
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, key, start, end):
+        """
+        Add a segment to the index.
+
+        Args:
+            key: Any hashable key identifying the segment (e.g. an element id).
+            start (tuple): Segment start point as (x, y).
+            end (tuple): Segment end point as (x, y).
+        """
+        self.segments[key] = (start, end)
+        min_i, min_j = self._cell(min(start[0], end[0]), min(start[1], end[1]))
+        max_i, max_j = self._cell(max(start[0], end[0]), max(start[1], end[1]))
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                self.cells.setdefault((i, j), []).append(key)
+
+    def query(self, x, y, radius):
+        """
+        Get the keys of all segments in the grid cells within a radius of a point.
+
+        Args:
+            x, y (float): The search point.
+            radius (float): The search radius.
+
+        Returns:
+            set: Candidate segment keys. These still need an exact distance check.
+        """
+        min_i, min_j = self._cell(x - radius, y - radius)
+        max_i, max_j = self._cell(x + radius, y + radius)
+        found = set()
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                found.update(self.cells.get((i, j), ()))
+        return found
+
+    def nearest(self, x, y, radius, accept=None):
+        """
+        Find the closest segment to a point within a search radius.
+
+        Args:
+            x, y (float): The search point.
+            radius (float): The search radius.
+            accept (callable, optional): Called with (key, start, end); segments
+                for which it returns False are ignored.
+
+        Returns:
+            tuple: (key, distance) of the closest segment, or (None, None).
+        """
+        best_key = None
+        best_distance = None
+        for key in self.query(x, y, radius):
+            start, end = self.segments[key]
+            if accept is not None and not accept(key, start, end):
+                continue
+            distance = point_segment_distance(x, y, start[0], start[1], end[0], end[1])
+            if distance <= radius and (best_distance is None or distance < best_distance):
+                best_key = key
+                best_distance = distance
+        return best_key, best_distance
+
+
+class PointTree(object):
+    """
+    2D k-d tree of points for nearest-point lookups.
+
+    Args:
+        points (iterable): (key, x, y) for each point, where key is any value
+            identifying the point (e.g. an element id).
+    """
+
+    def __init__(self, points):
+        self.root = self._build(list(points), 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 2
+        points.sort(key=lambda p: p[axis + 1])
+        median = len(points) // 2
+        return (
+            points[median],
+            axis,
+            self._build(points[:median], depth + 1),
+            self._build(points[median + 1:], depth + 1),
+        )
+
+    def nearest(self, x, y, radius=None):
+        """
+        Find the closest point to a location.
+
+        Args:
+            x, y (float): The search point.
+            radius (float, optional): Ignore points further away than this.
+
+        Returns:
+            tuple: (key, distance) of the closest point, or (None, None).
+        """
+        best = [None, float("inf") if radius is None else radius]
+        target = (x, y)
+        # Each entry holds a subtree and the least distance any point in it can be
+        stack = [(self.root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or bound > best[1]:
+                continue
+            point, axis, left, right = node
+            distance = math.hypot(point[1] - x, point[2] - y)
+            if distance <= best[1]:
+                best[0] = point
+                best[1] = distance
+            offset = target[axis] - point[axis + 1]
+            near, far = (left, right) if offset < 0 else (right, left)
+            # Search the near side first; the far side is only searched if still in reach
+            stack.append((far, abs(offset)))
+            stack.append((near, bound))
+        if best[0] is None:
+            return None, None
+        return best[0][0], best[1]
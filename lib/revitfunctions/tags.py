@@ -0,0 +1,145 @@
+from System.Collections.Generic import List
+from Autodesk.Revit.DB import (
+    ElementId,
+    FilteredElementCollector,
+    IndependentTag,
+    Viewport,
+)
+
+
+def probe_tag_api():
+    """
+    Work out once which tag API this Revit version exposes.
+
+    Revit 2022 replaced the single TaggedLocalElementId with the plural
+    GetTaggedLocalElementIds method.
+
+    Returns:
+        function: Takes a tag and returns a list of its tagged local element ids.
+    """
+    if hasattr(IndependentTag, "GetTaggedLocalElementIds"):
+        def get_tagged_ids(tag):
+            return list(tag.GetTaggedLocalElementIds())
+    else:
+        def get_tagged_ids(tag):
+            return [tag.TaggedLocalElementId]
+
+    return get_tagged_ids
+
+
+get_tagged_ids = probe_tag_api()
+
+
+def tagged_ids_for(tags):
+    """
+    Get the ids of all local elements attached to a set of tags.
+
+    Args:
+        tags (iterable): Autodesk.Revit.DB.IndependentTag elements.
+
+    Returns:
+        List[ElementId]: The unique tagged element ids, in tag order.
+    """
+    seen_ids = set()
+    element_ids = List[ElementId]()
+    for tag in tags:
+        for tagged_id in get_tagged_ids(tag):
+            if tagged_id == ElementId.InvalidElementId:
+                continue
+            key = tagged_id.IntegerValue
+            if key not in seen_ids:
+                seen_ids.add(key)
+                element_ids.Add(tagged_id)
+    return element_ids
+
+
+def build_tag_index(doc, view_id=None):
+    """
+    Map every tagged element to the tags attached to it, in one collector pass.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+        view_id (Autodesk.Revit.DB.ElementId, optional): Only index the tags in
+            this view, rather than the whole document.
+
+    Returns:
+        dict: Tagged element id (int) mapped to a list of
+            (tag id, owner view id, view type) tuples.
+    """
+    view_types = {}
+    index = {}
+    if view_id is None:
+        collector = FilteredElementCollector(doc)
+    else:
+        collector = FilteredElementCollector(doc, view_id)
+    for tag in collector.OfClass(IndependentTag):
+        owner_view_id = tag.OwnerViewId
+        view_key = owner_view_id.IntegerValue
+        if view_key not in view_types:
+            view = doc.GetElement(owner_view_id)
+            view_types[view_key] = view.ViewType if view else None
+        entry = (tag.Id, owner_view_id, view_types[view_key])
+        for tagged_id in get_tagged_ids(tag):
+            if tagged_id != ElementId.InvalidElementId:
+                index.setdefault(tagged_id.IntegerValue, []).append(entry)
+    return index
+
+
+def is_tagged_in_view(tag_index, element_id, view_id):
+    """
+    Check if an element has a tag owned by a view.
+
+    Args:
+        tag_index (dict): A tag index from build_tag_index.
+        element_id (Autodesk.Revit.DB.ElementId): The element to check.
+        view_id (Autodesk.Revit.DB.ElementId): The view the tag must belong to.
+
+    Returns:
+        bool: True if the element is tagged in the view.
+    """
+    return any(owner_view_id == view_id
+               for _, owner_view_id, _ in tag_index.get(element_id.IntegerValue, ()))
+
+
+def get_related_tag_ids(doc, element_ids, predicate=None, view_id=None):
+    """
+    Get the ids of the tags attached to a set of elements.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+        element_ids (iterable): The ids of the tagged elements.
+        predicate (callable, optional): Called with (owner view id, view type);
+            tags for which it returns False are left out.
+        view_id (Autodesk.Revit.DB.ElementId, optional): Only look at the tags
+            in this view.
+
+    Returns:
+        List[ElementId]: The related tag ids.
+    """
+    index = build_tag_index(doc, view_id)
+    seen_ids = set()
+    tag_ids = List[ElementId]()
+    for element_id in element_ids:
+        for tag_id, owner_view_id, view_type in index.get(element_id.IntegerValue, ()):
+            if tag_id.IntegerValue in seen_ids:
+                continue
+            if predicate is None or predicate(owner_view_id, view_type):
+                seen_ids.add(tag_id.IntegerValue)
+                tag_ids.Add(tag_id)
+    return tag_ids
+
+
+def get_views_on_sheets(doc):
+    """
+    Get the ids of all views placed on sheets.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+
+    Returns:
+        set: The view ids (int) placed on sheets.
+    """
+    return set(
+        viewport.ViewId.IntegerValue
+        for viewport in FilteredElementCollector(doc).OfClass(Viewport)
+    )
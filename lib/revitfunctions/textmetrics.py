@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+
+REO_TAG = "Reo Tag"
+
+# Glyph widths in mm of model space, by text type
+TEXT_WIDTHS = {
+    REO_TAG: {
+        "a": 129.0, "b": 129.0, "c": 107.5, "d": 129.0, "e": 129.0, "f": 86.0, "g": 129.0, "h": 129.0,
+        "i": 43.0, "j": 64.5, "k": 107.5, "l": 43.0, "m": 172.0, "n": 129.0, "o": 129.0, "p": 129.0,
+        "q": 129.0, "r": 86.0, "s": 107.5, "t": 64.5, "u": 129.0, "v": 107.5, "w": 172.0, "x": 107.5,
+        "y": 107.5, "z": 107.5,
+        "A": 172.0, "B": 150.5, "C": 150.5, "D": 150.5, "E": 150.5, "F": 129.0, "G": 172.0, "H": 150.5,
+        "I": 64.5, "J": 107.5, "K": 150.5, "L": 140.0, "M": 172.0, "N": 150.5, "O": 172.0, "P": 150.5,
+        "Q": 172.0, "R": 172.0, "S": 150.5, "T": 129.0, "U": 150.5, "V": 150.5, "W": 215.0, "X": 150.5,
+        "Y": 150.5, "Z": 129.0,
+        "1": 129.0, "2": 129.0, "3": 129.0, "4": 129.0, "5": 129.0, "6": 129.0, "7": 129.0, "8": 129.0,
+        "9": 129.0, "0": 129.0,
+        "-": 86.0, " ": 120.0, "(": 70.0, ")": 70.0, "/": 70.0, "\\": 70.0,
+    },
+}
+
+# Width used for glyphs missing from a table, by text type. Unknown glyphs are
+# given the widest width in the table so tags are never placed too close.
+FALLBACK_WIDTHS = {REO_TAG: max(TEXT_WIDTHS[REO_TAG].values())}
+
+# Number of measured strings kept before the least recently used is dropped
+CACHE_SIZE = 4096
+
+_MEASURED = OrderedDict()
+
+# Characters measured when building a table from a font file
+FONT_CHARACTERS = (
+    "abcdefghijklmnopqrstuvwxyz"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "0123456789"
+    "-() /\\.,@+x"
+)
+
+
+def register_text_type(text_type, widths, fallback=None):
+    """
+    Add or replace the width table of a text type.
+
+    Args:
+        text_type (str): The name of the text type.
+        widths (dict): Character mapped to its width in mm.
+        fallback (float, optional): Width of unknown glyphs; defaults to the widest glyph.
+    """
+    TEXT_WIDTHS[text_type] = dict(widths)
+    FALLBACK_WIDTHS[text_type] = fallback if fallback is not None else max(widths.values())
+    clear_cache(text_type)
+
+
+def widths_from_font(font_path, text_height, width_factor=1.0, characters=FONT_CHARACTERS):
+    """
+    Build a width table from a TrueType font file.
+
+    Requires PIL, so must be run from a CPython script. The result can be
+    printed and pasted into TEXT_WIDTHS, or passed to register_text_type.
+
+    Args:
+        font_path (str): Path to the .ttf file, e.g. C:\\Windows\\Fonts\\arial.ttf.
+        text_height (float): Text height in mm of model space (text size x view scale).
+        width_factor (float): The text type's width factor.
+        characters (str): The characters to measure.
+
+    Returns:
+        dict: Character mapped to its width in mm.
+    """
+    from PIL import ImageFont
+
+    # Measure at a large size so rounding to whole pixels is negligible
+    size = 1000
+    font = ImageFont.truetype(font_path, size)
+    scale = float(text_height) * width_factor / size
+    return dict((char, round(font.getlength(char) * scale, 1)) for char in characters)
+
+
+def measure(text, text_type=REO_TAG):
+    """
+    Get the width of a string, remembering recent results.
+
+    Args:
+        text (str): The text to measure.
+        text_type (str): The text type whose width table is used.
+
+    Returns:
+        float: The width of the text in mm.
+    """
+    key = (text_type, text)
+    width = _MEASURED.pop(key, None)
+    if width is None:
+        widths = TEXT_WIDTHS[text_type]
+        fallback = FALLBACK_WIDTHS[text_type]
+        width = sum(widths.get(char, fallback) for char in text)
+        if len(_MEASURED) >= CACHE_SIZE:
+            _MEASURED.popitem(last=False)
+    # Reinsert so the most recently used strings are evicted last
+    _MEASURED[key] = width
+    return width
+
+
+def clear_cache(text_type=None):
+    """Forget measured strings, for one text type or all of them."""
+    if text_type is None:
+        _MEASURED.clear()
+        return
+    for key in [x for x in _MEASURED if x[0] == text_type]:
+        del _MEASURED[key]
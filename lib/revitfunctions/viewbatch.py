@@ -0,0 +1,223 @@
+import time
+
+from Autodesk.Revit.DB import FilteredElementCollector, SubTransaction, View, Viewport, XYZ
+from pyrevit import revit
+
+
+# Offsets closer than this are treated as already set
+OFFSET_TOLERANCE = 1e-6
+
+
+class BatchResult(object):
+    """Counts and timing of a view batch operation."""
+
+    def __init__(self, name):
+        self.name = name
+        self.updated = 0
+        self.skipped = 0
+        self.failed = []
+        self.elapsed = 0.0
+
+    def report(self):
+        lines = ["{}: {} updated, {} already set, {} failed ({:.2f}s)".format(
+            self.name, self.updated, self.skipped, len(self.failed), self.elapsed
+        )]
+        for target in self.failed:
+            lines.append("  Failed: {}".format(describe_target(target)))
+        return "\n".join(lines)
+
+
+def describe_target(target):
+    """Name a view, or a viewport by the view it shows, with its element id."""
+    view = target
+    if isinstance(target, Viewport):
+        view = target.Document.GetElement(target.ViewId)
+    name = view.Name if view is not None else ""
+    return "{} [{}]".format(name, target.Id.IntegerValue)
+
+
+def get_views(doc):
+    """
+    Get all non-template views in the document.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+
+    Returns:
+        list: The views.
+    """
+    return [
+        view
+        for view in FilteredElementCollector(doc).OfClass(View)
+        if not view.IsTemplate
+    ]
+
+
+def get_viewports(doc):
+    """
+    Get all viewports in the document.
+
+    Args:
+        doc (Autodesk.Revit.DB.Document): The Revit document.
+
+    Returns:
+        list: The viewports.
+    """
+    return list(FilteredElementCollector(doc).OfClass(Viewport))
+
+
+def make_view_predicate(view_types=None, sheets=None):
+    """
+    Build a view filter from the common batch criteria.
+
+    Args:
+        view_types (iterable, optional): Allowed Autodesk.Revit.DB.ViewType values.
+        sheets (iterable, optional): Sheets the views must be placed on.
+
+    Returns:
+        callable: Takes a view and returns True if it matches every given criterion.
+    """
+    view_types = set(view_types) if view_types is not None else None
+    sheet_view_keys = None
+    if sheets is not None:
+        sheet_view_keys = set()
+        for sheet in sheets:
+            sheet_view_keys.update(x.IntegerValue for x in sheet.GetAllPlacedViews())
+
+    def predicate(view):
+        if view_types is not None and view.ViewType not in view_types:
+            return False
+        if sheet_view_keys is not None and view.Id.IntegerValue not in sheet_view_keys:
+            return False
+        return True
+
+    return predicate
+
+
+def resolve_views(doc, predicate):
+    """Get the views matching a predicate."""
+    return [view for view in get_views(doc) if predicate(view)]
+
+
+def resolve_viewports(doc, predicate):
+    """Get the viewports whose views match a predicate."""
+    views = dict((view.Id.IntegerValue, view) for view in get_views(doc))
+    return [
+        viewport
+        for viewport in get_viewports(doc)
+        if viewport.ViewId.IntegerValue in views
+        and predicate(views[viewport.ViewId.IntegerValue])
+    ]
+
+
+def run_view_batch(name, targets, read, write, value):
+    """
+    Apply a value to many views or viewports in a single transaction.
+
+    Targets whose current value already matches are skipped. Each write runs in
+    its own sub-transaction, so a target that raises part way through is rolled
+    back, left unchanged and listed as failed.
+
+    Args:
+        name (str): Transaction name.
+        targets (list): The views or viewports to update.
+        read (callable): Returns the current value of a target as a tuple of floats.
+        write (callable): Sets the value on a target.
+        value (tuple): The value to apply, as a tuple of floats.
+
+    Returns:
+        BatchResult: The counts and timing of the operation.
+    """
+    result = BatchResult(name)
+    start = time.time()
+    with revit.Transaction(name):
+        for target in targets:
+            try:
+                current = read(target)
+            except Exception:
+                result.failed.append(target)
+                continue
+            if all(abs(a - b) < OFFSET_TOLERANCE for a, b in zip(current, value)):
+                result.skipped += 1
+                continue
+            sub_transaction = SubTransaction(target.Document)
+            sub_transaction.Start()
+            try:
+                write(target, value)
+                sub_transaction.Commit()
+                result.updated += 1
+            except Exception:
+                sub_transaction.RollBack()
+                result.failed.append(target)
+    result.elapsed = time.time() - start
+    return result
+
+
+def get_annotation_crop_offsets(view):
+    """Get the (bottom, left, right, top) annotation crop offsets of a view."""
+    manager = view.GetCropRegionShapeManager()
+    return (
+        manager.BottomAnnotationCropOffset,
+        manager.LeftAnnotationCropOffset,
+        manager.RightAnnotationCropOffset,
+        manager.TopAnnotationCropOffset,
+    )
+
+
+def set_annotation_crop_offsets(view, offsets):
+    """Set the (bottom, left, right, top) annotation crop offsets of a view."""
+    bottom, left, right, top = offsets
+    manager = view.GetCropRegionShapeManager()
+    manager.BottomAnnotationCropOffset = bottom
+    manager.LeftAnnotationCropOffset = left
+    manager.RightAnnotationCropOffset = right
+    manager.TopAnnotationCropOffset = top
+
+
+def set_annotation_crop_offset(views, offset):
+    """
+    Set all four annotation crop offsets of many views in one transaction.
+
+    Args:
+        views (list): The views to update.
+        offset (float): The offset in feet.
+
+    Returns:
+        BatchResult: The counts and timing of the operation.
+    """
+    return run_view_batch(
+        "Set Annotation Crop Offset",
+        views,
+        get_annotation_crop_offsets,
+        set_annotation_crop_offsets,
+        (offset, offset, offset, offset),
+    )
+
+
+def get_label_offset(viewport):
+    offset = viewport.LabelOffset
+    return (offset.X, offset.Y, offset.Z)
+
+
+def set_label_offset(viewport, offset):
+    viewport.LabelOffset = XYZ(*offset)
+
+
+def set_viewport_label_offset(viewports, offset):
+    """
+    Set the label offset of many viewports in one transaction.
+
+    Args:
+        viewports (list): The viewports to update.
+        offset (tuple): The label offset as (x, y, z) in feet.
+
+    Returns:
+        BatchResult: The counts and timing of the operation.
+    """
+    return run_view_batch(
+        "Reset Viewport Label Position",
+        viewports,
+        get_label_offset,
+        set_label_offset,
+        offset,
+    )